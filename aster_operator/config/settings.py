@@ -1,25 +1,38 @@
 """
 Configuration settings for Aster Operator
 
-This module centralizes all bot configuration using Pydantic for type-safe settings
-management. Values can be overridden via environment variables or .env file.
+This module centralizes all bot configuration in a single frozen dataclass.
+Values can be overridden via environment variables or .env file.
 
 Educational Note:
-- Using pydantic_settings ensures type safety and validation
+- A plain dataclass + small loader keeps startup fast (no pydantic import graph)
+- Each value is converted to the field's annotated type when loaded
 - Settings are loaded from .env file automatically
 - This pattern makes it easy to deploy across different environments
 """
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+import json
+import os
+from dataclasses import MISSING, dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Dict, List
 
 
-class Settings(BaseSettings):
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Settings:
     """
     Bot configuration with sensible defaults for educational purposes.
 
     All settings can be overridden via environment variables or .env file.
     For production use, always use environment variables for secrets.
+
+    Fields without a default (API credentials, wallet address) are required -
+    loading fails with a clear error if they are missing.
+
+    Why frozen + slots?
+    - frozen: settings can't be changed by accident while the bot runs
+    - slots: no per-instance __dict__; each attribute read is a direct
+      slot lookup, which matters for values read on every order/cycle
     """
 
     # ============================================================================
@@ -33,7 +46,7 @@ class Settings(BaseSettings):
     # - Use read+write permissions (bot needs to place orders)
     # - Enable IP whitelist in production for extra security
     aster_api_key: str
-    aster_api_secret: str
+    aster_api_secret: str = field(repr=False)  # keep the secret out of logs
 
     # Base URL for Aster's REST API (futures/perpetuals endpoint)
     # This is the production endpoint - testnet would use a different URL
@@ -147,7 +160,17 @@ class Settings(BaseSettings):
     # - More pairs = more diversification but more complexity
     #
     # Note: Current bot version only uses the first pair in the list
-    trading_pairs: List[str] = ["BTCUSDT"]
+    trading_pairs: List[str] = field(default_factory=lambda: ["BTCUSDT"])
+
+    # Quantity step size (lot size) of the traded symbol
+    #
+    # Exchanges only accept order quantities that are a multiple of the
+    # symbol's step size - anything else is rejected. For BTCUSDT on Aster
+    # this is 0.001 BTC. Position sizes are rounded DOWN to a multiple of it.
+    #
+    # Check the symbol's LOT_SIZE filter (GET /fapi/v1/exchangeInfo) when
+    # trading other pairs, e.g. ETHUSDT uses 0.001, many altcoins use 1
+    symbol_tick_size: float = 0.001
 
     # ============================================================================
     # RISK MANAGEMENT PARAMETERS
@@ -244,14 +267,146 @@ class Settings(BaseSettings):
     db_path: str = "aster-operator.db"
 
     # ============================================================================
-    # PYDANTIC CONFIGURATION
+    # MONITORING
     # ============================================================================
-    # This tells Pydantic to load settings from .env file
-    # Secrets should NEVER be hardcoded - always use environment variables
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
+    # Port for the Prometheus metrics endpoint (http://host:PORT/metrics)
+    #
+    # Exposes live counters: volume, fees, trades, realized PnL, hold times
+    # Point Prometheus/Grafana at it for dashboards and alerts
+    # Set to 0 to disable the endpoint
+    metrics_port: int = 9100
+
+
+def _convert(name: str, raw: str, annotation: Any) -> Any:
+    """
+    Convert a raw string from .env / environment into the field's type.
+
+    Supported types: str, int, float, bool and List[str] (given as JSON,
+    e.g. TRADING_PAIRS=["BTCUSDT","ETHUSDT"]).
+    """
+    try:
+        if annotation is str:
+            return raw
+        if annotation is bool:
+            return raw.strip().lower() in ("1", "true", "yes", "on")
+        if annotation in (int, float):
+            return annotation(raw)
+        # Complex types (lists) are written as JSON
+        return json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"Invalid value for {name.upper()}: {raw!r} ({e})") from e
+
+
+def _parse_dotenv(path: str) -> Dict[str, str]:
+    """
+    Parse a .env file in a single pass over its lines.
+
+    Supports the subset of the format this project uses:
+    - KEY=value, with optional `export ` prefix
+    - blank lines and `#` comment lines
+    - single/double quoted values (quotes are stripped)
+    - trailing ` # comment` after unquoted values
+
+    A missing file simply yields no values (environment variables still apply).
+    """
+    try:
+        with open(path, encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+    except FileNotFoundError:
+        return {}
+
+    values: Dict[str, str] = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[7:]
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key.strip()] = value
+    return values
+
+
+def _load_env(env_file: str = ".env") -> Dict[str, str]:
+    """
+    Merge .env values and environment variables into one lowercase-keyed dict.
+
+    Both sources are read once per load and merged in a single pass, so
+    resolving N settings costs N dict lookups (no per-field file or
+    environment scans). Environment variables win over .env values.
 
-# Global settings instance
-# Import this in other modules: from aster_operator.config.settings import settings
-settings = Settings()
+    Not cached itself - get_settings() caches the finished Settings, so
+    clearing that one cache really does re-read the environment.
+    """
+    merged = {**_parse_dotenv(env_file), **os.environ}
+    return {key.lower(): value for key, value in merged.items()}
+
+
+def load_settings(env_file: str = ".env") -> Settings:
+    """
+    Read .env + environment variables and build a Settings instance.
+
+    Precedence (highest first):
+    1. Environment variables (e.g. set by Docker or your shell)
+    2. Values from the .env file
+    3. Defaults declared on Settings
+
+    Variable names are case-insensitive: ASTER_API_KEY -> aster_api_key.
+    Secrets should NEVER be hardcoded - always use environment variables.
+    """
+    raw = _load_env(env_file)
+
+    values: Dict[str, Any] = {}
+    missing: List[str] = []
+    for f in fields(Settings):
+        if f.name in raw:
+            values[f.name] = _convert(f.name, raw[f.name], f.type)
+        elif f.default is MISSING and f.default_factory is MISSING:
+            missing.append(f.name.upper())
+
+    if missing:
+        raise ValueError(
+            f"Missing required settings: {', '.join(missing)}. "
+            f"Set them in your .env file or environment."
+        )
+
+    return Settings(**values)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Build the Settings object once per process and reuse it.
+
+    Why cache?
+    - Loading parses .env and converts every field to its type
+    - That work only needs to happen once - the values don't change at runtime
+    - lru_cache(maxsize=1) turns this into a lazily-created singleton
+
+    Tests can call get_settings.cache_clear() to force a reload.
+    """
+    return load_settings()
+
+
+def __getattr__(name: str):
+    """
+    Lazily resolve the module-level `settings` attribute (PEP 562).
+
+    Existing code keeps working unchanged:
+        from aster_operator.config.settings import settings
+
+    but the .env file is only parsed the first time `settings` is requested,
+    so modules that import this file without touching settings pay nothing.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -1,16 +1,47 @@
-from sqlalchemy import create_engine
+from datetime import date
+from typing import Any, Dict, List
+from sqlalchemy import create_engine, delete, event, func, insert, select
 from sqlalchemy.orm import sessionmaker, Session
 from aster_operator.config.settings import settings
-from aster_operator.database.models import Base
+from aster_operator.database.models import Base, DailyStats, Trade
 from contextlib import contextmanager
 from loguru import logger
 
-engine = create_engine(f"sqlite:///{settings.db_path}", echo=False)
+# check_same_thread=False lets the session be used from worker threads
+# (SQLAlchemy's pool already prevents two threads sharing a connection)
+engine = create_engine(
+    f"sqlite:///{settings.db_path}",
+    echo=False,
+    connect_args={"check_same_thread": False},
+)
 SessionLocal = sessionmaker(bind=engine)
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune SQLite for a write-heavy single-process bot.
+
+    - WAL journal: readers don't block the writer, and commits append to the
+      log instead of rewriting the main database file
+    - synchronous=NORMAL: fsync at checkpoints rather than on every commit
+      (safe with WAL - a power cut can lose the last commit, never corrupt)
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables and indexes"""
     Base.metadata.create_all(bind=engine)
+    # create_all() skips tables that already exist, so indexes added to the
+    # models later would never reach an existing database file. Create any
+    # missing ones explicitly (checkfirst makes this a no-op when present).
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     logger.info(f"Database initialized: {settings.db_path}")
 
 @contextmanager
@@ -27,3 +58,49 @@ def get_db() -> Session:
     finally:
         db.close()
 
+def bulk_insert_trades(db: Session, rows: List[Dict[str, Any]]):
+    """
+    Insert many trades with a single executemany() INSERT.
+
+    Takes plain dicts (column name → value) instead of Trade objects, so no
+    ORM objects or identity-map bookkeeping are created per row.
+
+    Usage:
+        with get_db() as db:
+            bulk_insert_trades(db, [{"symbol": "BTCUSDT", ...}, ...])
+        # get_db() commits once on exit → one transaction for all rows
+    """
+    if rows:
+        db.execute(insert(Trade), rows)
+
+def refresh_daily_stats(db: Session, day: date):
+    """
+    Recompute the DailyStats row for `day` from the trades table.
+
+    The aggregation runs entirely inside SQLite as one
+    INSERT ... SELECT ... GROUP BY - no Trade objects are loaded into Python.
+    Any existing row for that day is replaced (deleted first, in the same
+    transaction), so calling this repeatedly is safe.
+    """
+    day_str = day.isoformat()  # SQLite DATE() returns 'YYYY-MM-DD'
+    trade_day = func.date(Trade.timestamp)
+
+    db.execute(delete(DailyStats).where(func.date(DailyStats.date) == day_str))
+
+    summary = (
+        select(
+            func.datetime(trade_day),
+            func.sum(Trade.notional),
+            func.count(),
+            func.sum(Trade.realized_pnl),
+            func.sum(Trade.commission),
+        )
+        .where(trade_day == day_str)
+        .group_by(trade_day)
+    )
+    db.execute(
+        insert(DailyStats).from_select(
+            ["date", "total_volume", "num_trades", "realized_pnl", "fees_paid"],
+            summary,
+        )
+    )
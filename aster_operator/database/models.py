@@ -16,11 +16,29 @@ Educational Note:
 - Easy to query: db.query(Trade).filter(Trade.symbol == "BTCUSDT")
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean
-from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+from typing import Optional
+from sqlalchemy import Float, Index, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, MappedAsDataclass, mapped_column
 
-Base = declarative_base()
+
+class Base(MappedAsDataclass, DeclarativeBase, kw_only=True, eq=False):
+    """
+    Declarative base for all models (SQLAlchemy 2.0 style).
+
+    - Mapped[...] annotations give type checkers and IDEs real column types
+    - MappedAsDataclass generates __init__ from the columns, so constructing
+      a row is a plain keyword-argument call: Trade(symbol=..., side=...)
+    - kw_only=True keeps that call keyword-only (no field-order pitfalls)
+    - eq=False keeps identity-based equality/hashing, which the ORM relies on
+
+    Note: __slots__ are not used - SQLAlchemy's attribute instrumentation
+    needs a per-instance __dict__. For large reads, aggregate in SQL
+    instead of loading objects (see database.db.refresh_daily_stats).
+    """
+
+    # Keep float columns as FLOAT (newer SQLAlchemy would default to DOUBLE)
+    type_annotation_map = {float: Float}
 
 
 class Trade(Base):
@@ -49,20 +67,36 @@ class Trade(Base):
 
     __tablename__ = "trades"
 
+    # Indexes for the hot queries:
+    # - "today's volume": WHERE timestamp >= ?            → ix on timestamp
+    # - "today's volume for BTCUSDT": WHERE symbol = ? AND timestamp >= ?
+    #   → composite (symbol, timestamp) also serves symbol-only lookups
+    __table_args__ = (
+        Index("ix_trade_sym_ts", "symbol", "timestamp"),
+    )
+
     # Primary key (auto-incrementing ID)
-    id = Column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
 
     # When this trade executed (UTC timezone)
     # Why UTC? No daylight savings confusion, standard for exchanges
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    # Filled in by the database (CURRENT_TIMESTAMP is UTC in SQLite), so
+    # inserts don't need to build a Python datetime for every row.
+    # insert_default puts CURRENT_TIMESTAMP in our INSERT statements, so
+    # database files created before the column had a DEFAULT (SQLite can't
+    # add one later) still get timestamps; server_default covers new files.
+    timestamp: Mapped[Optional[datetime]] = mapped_column(
+        insert_default=func.current_timestamp(),
+        server_default=func.current_timestamp(), index=True, init=False
+    )
 
     # Trading pair (e.g., "BTCUSDT", "ETHUSDT")
-    symbol = Column(String, nullable=False)
+    symbol: Mapped[str] = mapped_column()
 
     # BUY or SELL (from exchange perspective)
     # BUY = you're buying the base currency (BTC)
     # SELL = you're selling the base currency (BTC)
-    side = Column(String, nullable=False)
+    side: Mapped[str] = mapped_column()
 
     # LONG or SHORT (for hedge mode)
     # This is separate from side because:
@@ -70,37 +104,37 @@ class Trade(Base):
     # - To close LONG: SELL with position_side=LONG
     # - To open SHORT: SELL with position_side=SHORT
     # - To close SHORT: BUY with position_side=SHORT
-    position_side = Column(String, nullable=False)
+    position_side: Mapped[str] = mapped_column()
 
     # Order type (MARKET, LIMIT, etc.)
     # We use MARKET for instant fills (higher fees but guaranteed execution)
-    order_type = Column(String, default="MARKET")
+    order_type: Mapped[Optional[str]] = mapped_column(default="MARKET")
 
     # How much we traded (in base currency, e.g., BTC)
-    quantity = Column(Float, nullable=False)
+    quantity: Mapped[float] = mapped_column()
 
     # Execution price (average if partial fills)
-    price = Column(Float, nullable=False)
+    price: Mapped[float] = mapped_column()
 
     # Total USD value: quantity × price
     # This is what counts toward volume rewards on Aster
-    notional = Column(Float, nullable=False)
+    notional: Mapped[float] = mapped_column()
 
     # Unique order ID from exchange (for reconciliation)
-    order_id = Column(String, unique=True)
+    order_id: Mapped[Optional[str]] = mapped_column(unique=True, default=None)
 
     # Realized PnL from this trade (if closing position)
     # Opening trade: $0 (no PnL yet)
     # Closing trade: actual profit/loss from price difference
-    realized_pnl = Column(Float, default=0.0)
+    realized_pnl: Mapped[Optional[float]] = mapped_column(default=0.0)
 
     # Trading fees paid (maker = lower, taker = higher)
     # Aster fees: ~0.02% maker, ~0.05% taker
-    commission = Column(Float, default=0.0)
+    commission: Mapped[Optional[float]] = mapped_column(default=0.0)
 
     # Order status (FILLED, PARTIALLY_FILLED, CANCELLED, etc.)
     # We only store FILLED orders
-    status = Column(String, default="FILLED")
+    status: Mapped[Optional[str]] = mapped_column(default="FILLED")
 
     def __repr__(self):
         return f"<Trade {self.symbol} {self.side} {self.quantity} @ {self.price}>"
@@ -134,52 +168,62 @@ class Position(Base):
 
     __tablename__ = "positions"
 
-    id = Column(Integer, primary_key=True)
+    # "Active position for symbol/side" is looked up on every rotation:
+    # WHERE is_active = 1 AND symbol = ? AND position_side = ?
+    # The composite index answers it without scanning closed positions.
+    __table_args__ = (
+        Index("ix_pos_active_sym", "is_active", "symbol", "position_side"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
 
     # When position was opened (first trade)
-    opened_at = Column(DateTime, default=datetime.utcnow)
+    opened_at: Mapped[Optional[datetime]] = mapped_column(
+        insert_default=func.current_timestamp(),
+        server_default=func.current_timestamp(), init=False
+    )
 
     # When position was closed (last trade)
     # NULL = still open
-    closed_at = Column(DateTime, nullable=True)
+    closed_at: Mapped[Optional[datetime]] = mapped_column(index=True, default=None)
 
     # Trading pair
-    symbol = Column(String, nullable=False)
+    symbol: Mapped[str] = mapped_column()
 
     # LONG or SHORT
-    position_side = Column(String, nullable=False)
+    position_side: Mapped[str] = mapped_column()
 
     # Price when we entered the position
     # Used to calculate PnL: (exit_price - entry_price) × quantity
-    entry_price = Column(Float, nullable=False)
+    entry_price: Mapped[float] = mapped_column()
 
     # Price when we closed (NULL if still open)
-    exit_price = Column(Float, nullable=True)
+    exit_price: Mapped[Optional[float]] = mapped_column(default=None)
 
     # Position size in base currency
-    quantity = Column(Float, nullable=False)
+    quantity: Mapped[float] = mapped_column()
 
     # Leverage used (e.g., 15x)
     # Important for calculating margin requirements
-    leverage = Column(Integer, nullable=False)
+    leverage: Mapped[int] = mapped_column()
 
     # Total notional value: quantity × entry_price
     # This is what counts for reward calculations
-    notional = Column(Float, nullable=False)
+    notional: Mapped[float] = mapped_column()
 
     # How long we held this position (minutes)
     # Critical metric: >90 minutes = 10x multiplier on Aster
-    hold_time_minutes = Column(Integer, default=0)
+    hold_time_minutes: Mapped[Optional[int]] = mapped_column(default=0)
 
     # Final PnL when position closed
     # LONG PnL: (exit_price - entry_price) × quantity
     # SHORT PnL: (entry_price - exit_price) × quantity
-    realized_pnl = Column(Float, default=0.0)
+    realized_pnl: Mapped[Optional[float]] = mapped_column(default=0.0)
 
     # Is this position currently open?
     # True = open, False = closed
     # Used for querying: "Show me all active positions"
-    is_active = Column(Boolean, default=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
 
     def __repr__(self):
         return f"<Position {self.symbol} {self.position_side} {self.quantity}>"
@@ -210,33 +254,36 @@ class DailyStats(Base):
 
     __tablename__ = "daily_stats"
 
-    id = Column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
 
     # Date of this stats snapshot (one row per day)
-    date = Column(DateTime, default=datetime.utcnow)
+    date: Mapped[Optional[datetime]] = mapped_column(
+        insert_default=func.current_timestamp(),
+        server_default=func.current_timestamp(), init=False
+    )
 
     # Total volume traded (sum of all notional values)
     # Goal: Meet or exceed DAILY_VOLUME_TARGET from settings
-    total_volume = Column(Float, default=0.0)
+    total_volume: Mapped[Optional[float]] = mapped_column(default=0.0)
 
     # Total number of trades executed
     # More trades = more fees, but also more volume for rewards
-    num_trades = Column(Integer, default=0)
+    num_trades: Mapped[Optional[int]] = mapped_column(default=0)
 
     # Net profit/loss for the day
     # Includes: realized PnL from positions + funding payments - fees
     # For delta-neutral strategy, expect small positive/negative (near $0)
-    realized_pnl = Column(Float, default=0.0)
+    realized_pnl: Mapped[Optional[float]] = mapped_column(default=0.0)
 
     # Total trading fees paid
     # This is your main "cost" for generating volume
     # Track to ensure fees < reward value
-    fees_paid = Column(Float, default=0.0)
+    fees_paid: Mapped[Optional[float]] = mapped_column(default=0.0)
 
     # Estimated Reward Handle (RH) points earned
     # Formula (Aster Genesis Stage 3):
     # - Volume points: total_volume × 1
     # - Hold points: SUM(notional × hold_time_minutes × 10) for holds >90min
     # This is an estimate - actual points calculated by Aster
-    rh_points_estimated = Column(Float, default=0.0)
+    rh_points_estimated: Mapped[Optional[float]] = mapped_column(default=0.0)
 
@@ -1,24 +1,35 @@
 """Utility functions for Aster SDK"""
+import re
 import time
 from urllib.parse import urlencode
 
+# Characters urlencode() never escapes (plus '@[]' for "special" endpoints).
+# Strings made only of these encode to themselves, so we can skip quoting.
+_is_plain = re.compile(r"[A-Za-z0-9_.~-]*").fullmatch
+_is_plain_special = re.compile(r"[A-Za-z0-9_.~@\[\]-]*").fullmatch
+_NUMBER_TYPES = (int, float)
+
 
 def get_timestamp():
     """Get current timestamp in milliseconds"""
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 def cleanNoneValue(d):
     """Remove None values from dictionary"""
-    out = {}
-    for k in d.keys():
-        if d[k] is not None:
-            out[k] = d[k]
-    return out
+    return {k: v for k, v in d.items() if v is not None}
 
 
 def encoded_string(query, special=False):
     """Encode query parameters"""
+    # Fast path: typical signed payloads (symbol, side, quantity, timestamp)
+    # contain nothing that needs escaping - join them directly
+    is_plain = _is_plain_special if special else _is_plain
+    if all(
+        is_plain(k) and (type(v) in _NUMBER_TYPES or (type(v) is str and is_plain(v)))
+        for k, v in query.items()
+    ):
+        return "&".join(f"{k}={v}" for k, v in query.items())
     if special:
         return urlencode(query, safe='@[]')
     return urlencode(query, True)
@@ -32,7 +43,6 @@ def check_required_parameter(value, name):
 
 def check_required_parameters(params):
     """Check if multiple required parameters are provided"""
-    for [param, name] in params:
-        if not param and param != 0:
-            raise ValueError(f"Required parameter '{name}' is missing")
+    if missing := next((name for param, name in params if not param and param != 0), None):
+        raise ValueError(f"Required parameter '{missing}' is missing")
 
@@ -53,3 +53,8 @@ class Client(API):
     from .account import force_orders
     from .account import commission_rate
 
+
+    # STREAMS
+    from .data_stream import new_listen_key
+    from .data_stream import renew_listen_key
+    from .data_stream import close_listen_key
@@ -1,3 +1,5 @@
+import orjson
+
 from ..lib.utils import check_required_parameter
 from ..lib.utils import check_required_parameters
 
@@ -95,7 +97,9 @@ def new_batch_order(self, batchOrders: list):
     |
     """
 
-    params = {"batchOrders": batchOrders}
+    # The endpoint expects a JSON array - str(list) would produce Python
+    # repr with single quotes, which the server rejects
+    params = {"batchOrders": orjson.dumps(batchOrders).decode()}
     url_path = "/fapi/v1/batchOrders"
     return self.sign_request("POST", url_path, params, True)
 
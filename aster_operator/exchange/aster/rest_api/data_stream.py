@@ -0,0 +1,50 @@
+from ..lib.utils import check_required_parameter
+
+
+def new_listen_key(self):
+    """
+    |
+    | **Start User Data Stream (USER_STREAM)**
+    | *Start a new user data stream. The stream will close after 60 minutes unless a keepalive is sent.*
+
+    :API endpoint: ``POST /fapi/v1/listenKey``
+    :API doc: https://github.com/asterdex/api-docs/blob/master/aster-finance-api.md#user-data-streams
+    |
+    """
+
+    url_path = "/fapi/v1/listenKey"
+    return self.limit_request("POST", url_path)
+
+
+def renew_listen_key(self, listenKey: str):
+    """
+    |
+    | **Keepalive User Data Stream (USER_STREAM)**
+    | *Keepalive a user data stream to prevent a time out. It's recommended to send a ping about every 60 minutes.*
+
+    :API endpoint: ``PUT /fapi/v1/listenKey``
+    :API doc: https://github.com/asterdex/api-docs/blob/master/aster-finance-api.md#user-data-streams
+    |
+    """
+
+    check_required_parameter(listenKey, "listenKey")
+    payload = {"listenKey": listenKey}
+    url_path = "/fapi/v1/listenKey"
+    return self.limit_request("PUT", url_path, payload)
+
+
+def close_listen_key(self, listenKey: str):
+    """
+    |
+    | **Close User Data Stream (USER_STREAM)**
+    | *Close out a user data stream.*
+
+    :API endpoint: ``DELETE /fapi/v1/listenKey``
+    :API doc: https://github.com/asterdex/api-docs/blob/master/aster-finance-api.md#user-data-streams
+    |
+    """
+
+    check_required_parameter(listenKey, "listenKey")
+    payload = {"listenKey": listenKey}
+    url_path = "/fapi/v1/listenKey"
+    return self.limit_request("DELETE", url_path, payload)
@@ -19,11 +19,17 @@ Exchange API Resources:
 """
 
 from loguru import logger
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import asyncio
+import random
 import time
-from aster_operator.config.settings import settings
+import uuid
+import requests
+from requests.adapters import HTTPAdapter
+from aster_operator.config.settings import get_settings
 from aster_operator.exchange.aster.rest_api import Client as AsterClient
 from aster_operator.exchange.aster.error import ClientError, ServerError
+from aster_operator.exchange.rate_limiter import Priority, RateLimiter
 
 
 class AsterExchangeClient:
@@ -46,6 +52,32 @@ class AsterExchangeClient:
         price = client.get_mark_price("BTCUSDT")
     """
 
+    # How long (seconds) a mark price / position snapshot is reused.
+    # One strategy cycle often asks for the same data several times in a row;
+    # a short TTL collapses those into a single REST call without serving
+    # meaningfully stale data.
+    PRICE_CACHE_TTL = 0.25
+    POSITION_CACHE_TTL = 0.25
+
+    # Retry policy for read-only calls (balance, positions, mark price).
+    # Exponential backoff with jitter: ~0.1s, ~0.2s ... capped at 1s.
+    # Orders are never retried here - a timed-out order may still have
+    # filled, and resending it could double the position.
+    RETRY_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 0.1
+    RETRY_MAX_DELAY = 1.0
+    RETRYABLE_ERRORS = (ServerError, requests.ConnectionError, requests.Timeout)
+
+    # Exchange request-weight limit (per IP/key per minute)
+    RATE_LIMIT_WEIGHT_PER_MINUTE = 2400
+
+    # Order fields that are the same for every market order we send
+    # (RESULT response type returns fill price/qty in the order response)
+    _MARKET_ORDER_TEMPLATE = {"type": "MARKET", "newOrderRespType": "RESULT"}
+
+    # Prefix of our client order IDs - identifies the bot's own orders
+    CLIENT_ORDER_ID_PREFIX = "aop-"
+
     def __init__(self):
         """
         Initialize Aster API client with credentials from settings.
@@ -63,32 +95,118 @@ class AsterExchangeClient:
         Raises:
             ValueError: If API keys are missing from settings
         """
-        if not settings.aster_api_key or not settings.aster_api_secret:
+        # Resolve settings once and keep a local reference
+        # (avoids repeated module/attribute lookups in the methods below)
+        self._s = s = get_settings()
+
+        if not s.aster_api_key or not s.aster_api_secret:
             raise ValueError(
                 "Missing Aster API credentials. "
                 "Please set ASTER_API_KEY and ASTER_API_SECRET in your .env file"
             )
 
         self.client = AsterClient(
-            key=settings.aster_api_key,
-            secret=settings.aster_api_secret,
-            base_url=settings.aster_base_url,
+            key=s.aster_api_key,
+            secret=s.aster_api_secret,
+            base_url=s.aster_base_url,
             timeout=10  # 10-second timeout for API calls
         )
-        logger.info(f"✅ Aster client initialized (endpoint: {settings.aster_base_url})")
+
+        # Connection pooling: the SDK already keeps one requests.Session, so
+        # TCP + TLS handshakes are paid once and connections are kept alive.
+        # Every REST call (orders, positions, prices, leverage, listenKeys)
+        # goes through this one session. We mount a tuned adapter on it:
+        # - pool sized for concurrent calls from AsyncAsterExchangeClient
+        #   worker threads (both closes at once + stream keepalives)
+        # - no transport-level retries: _retry() is the ONE retry layer.
+        #   Stacking urllib3 retries under it would multiply the attempts
+        #   (3 × 4 = 12 calls for one read) and spend request weight the
+        #   RateLimiter never accounted for. 429s are avoided up front by
+        #   the RateLimiter rather than retried.
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=0,
+        )
+        self.client.session.mount("https://", adapter)
+        self.client.session.mount("http://", adapter)
+        logger.info(f"✅ Aster client initialized (endpoint: {s.aster_base_url})")
+
+        # Short-lived response caches: key → (monotonic timestamp, value)
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._position_cache: Dict[Optional[str], Tuple[float, list]] = {}
+
+        # Quantities we opened ourselves: (symbol, position_side) → qty
+        # Lets close_position() skip a REST lookup for positions it knows.
+        # Empty after a restart - close_position() then asks the exchange.
+        self._open: Dict[Tuple[str, str], float] = {}
+
+        # Request-weight budget, shared by everything using this client.
+        # Every response reports the weight used so far this minute; a
+        # session hook feeds that back so our estimate matches the exchange.
+        self.rate_limiter = RateLimiter(self.RATE_LIMIT_WEIGHT_PER_MINUTE)
+        self.client.session.hooks["response"].append(self._observe_rate_limit)
+
+    def _observe_rate_limit(self, response: requests.Response, *args, **kwargs):
+        """requests response hook: read X-MBX-USED-WEIGHT-1M"""
+        used = response.headers.get("X-MBX-USED-WEIGHT-1M")
+        if used is not None:
+            self.rate_limiter.observe_used_weight(int(used))
+
+    def close(self):
+        """Close pooled connections (call once on shutdown)"""
+        self.client.session.close()
+
+    def _retry(self, operation, *args, **kwargs):
+        """
+        Call operation(*args, **kwargs), retrying transient failures.
+
+        Retries: server errors (5xx) and network errors
+        Never retries: ClientError (4xx) - the request itself is wrong,
+        sending it again would fail the same way
+
+        The success path is a single call with no extra allocations.
+        """
+        for attempt in range(1, self.RETRY_ATTEMPTS + 1):
+            try:
+                return operation(*args, **kwargs)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.RETRY_ATTEMPTS:
+                    raise
+                delay = min(self.RETRY_BASE_DELAY * 2 ** (attempt - 1), self.RETRY_MAX_DELAY)
+                delay *= random.uniform(0.5, 1.5)
+                logger.warning(
+                    f"{operation.__name__} failed ({e!r}), "
+                    f"retry {attempt}/{self.RETRY_ATTEMPTS - 1} in {delay:.2f}s"
+                )
+                time.sleep(delay)
+
+    def invalidate_price(self, symbol: str):
+        """Drop the cached mark price for a symbol (next call hits the API)"""
+        self._price_cache.pop(symbol, None)
+
+    def invalidate_positions(self, symbol: Optional[str] = None):
+        """Drop cached positions for a symbol and the all-symbols snapshot"""
+        self._position_cache.pop(symbol, None)
+        self._position_cache.pop(None, None)
     
     def get_account_balance(self) -> Dict[str, Any]:
         """Get account balance"""
         try:
-            return self.client.balance()
+            return self._retry(self.client.balance)
         except (ClientError, ServerError) as e:
             logger.error(f"Failed to get balance: {e}")
             raise
     
     def get_position_risk(self, symbol: Optional[str] = None) -> list:
-        """Get current positions"""
+        """Get current positions (reused for POSITION_CACHE_TTL seconds)"""
+        cached = self._position_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < self.POSITION_CACHE_TTL:
+            return cached[1]
         try:
-            return self.client.get_position_risk(symbol=symbol)
+            positions = self._retry(self.client.get_position_risk, symbol=symbol)
+            self._position_cache[symbol] = (time.monotonic(), positions)
+            return positions
         except (ClientError, ServerError) as e:
             logger.error(f"Failed to get positions: {e}")
             raise
@@ -103,42 +221,171 @@ class AsterExchangeClient:
     ) -> Dict[str, Any]:
         """Place a market order (taker for 2x points)"""
         try:
-            # Only include reduceOnly parameter if it's True
+            # Constant fields come from the template; one dict merge
+            # adds the per-order ones
             order_params = {
+                **self._MARKET_ORDER_TEMPLATE,
                 "symbol": symbol,
                 "side": side,
-                "type": "MARKET",
                 "quantity": quantity,
                 "positionSide": position_side,
-                "newOrderRespType": "RESULT"
+                "newClientOrderId": self._new_client_order_id(),
             }
-            
+
             # Only add reduceOnly if it's True
             if reduce_only:
-                order_params["reduceOnly"] = reduce_only
-                
+                order_params["reduceOnly"] = True
+
             order = self.client.new_order(**order_params)
-            logger.info(f"Order placed: {symbol} {side} {quantity} {position_side} | OrderID: {order['orderId']}")
+            # Our own fill changes positions (and may move the price) -
+            # make sure the next read goes to the exchange
+            self.invalidate_price(symbol)
+            self.invalidate_positions(symbol)
+            self._track_fill(symbol, position_side, order, quantity, reduce_only)
+            # Pass values as arguments (not an f-string): loguru only formats
+            # the message if a sink accepts INFO, so filtered logs cost ~nothing
+            logger.info(
+                "Order placed: {} {} {} {} | OrderID: {}",
+                symbol, side, quantity, position_side, order['orderId']
+            )
             return order
         except ClientError as e:
             logger.error(f"Order failed: {e.error_code} - {e.error_message}")
             raise
     
+    def place_batch_market_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several market orders in ONE signed request (max 5 per batch).
+
+        Why batch?
+        - One HTTP round-trip + one signature instead of one per order
+        - Both legs of a pair reach the matching engine together, so the
+          price can't drift between them (smaller entry mismatch)
+        - Counts as a single request against rate limits
+
+        Parameters:
+            orders: API-style order dicts, e.g.
+                [{"symbol": "BTCUSDT", "side": "BUY", "positionSide": "LONG", "quantity": 0.01},
+                 {"symbol": "BTCUSDT", "side": "SELL", "positionSide": "SHORT", "quantity": 0.01}]
+
+        Returns:
+            One result per order, in the same order. Each entry is either an
+            order response or an error object ({"code": ..., "msg": ...}) -
+            the exchange accepts or rejects each order independently!
+        """
+        batch = [
+            # The API expects every value as a string inside the JSON array
+            {
+                **self._MARKET_ORDER_TEMPLATE,
+                "newClientOrderId": self._new_client_order_id(),
+                **{k: str(v) for k, v in order.items()},
+            }
+            for order in orders
+        ]
+        try:
+            results = self.client.new_batch_order(batch)
+        except ClientError as e:
+            logger.error(f"Batch order failed: {e.error_code} - {e.error_message}")
+            raise
+
+        for order, result in zip(orders, results):
+            symbol, position_side = order["symbol"], order["positionSide"]
+            self.invalidate_price(symbol)
+            self.invalidate_positions(symbol)
+            if "code" in result and "orderId" not in result:
+                logger.error(
+                    f"Batch leg rejected: {symbol} {order['side']} {position_side} | "
+                    f"{result.get('code')} - {result.get('msg')}"
+                )
+                continue
+            self._track_fill(
+                symbol, position_side, result, float(order["quantity"]),
+                bool(order.get("reduceOnly"))
+            )
+            logger.info(
+                "Order placed: {} {} {} {} | OrderID: {}",
+                symbol, order["side"], order["quantity"], position_side, result["orderId"]
+            )
+        return results
+
+    def _new_client_order_id(self) -> str:
+        """
+        Unique, random client order ID, e.g. "aop-3f9c1e0a7b2d4c68".
+
+        Gives every order its own random identifier (instead of the
+        exchange's sequential default) and lets us find our orders later.
+        """
+        return f"{self.CLIENT_ORDER_ID_PREFIX}{uuid.uuid4().hex[:16]}"
+
+    def _track_fill(
+        self,
+        symbol: str,
+        position_side: str,
+        order: Dict[str, Any],
+        quantity: float,
+        reduce_only: bool
+    ):
+        """Update the in-memory open quantity after one of our orders fills"""
+        key = (symbol, position_side)
+        if reduce_only:
+            self._open.pop(key, None)
+            return
+        filled = float(order.get('executedQty') or quantity)
+        # Round away float noise when scaling in (0.1 + 0.2 != 0.3)
+        self._open[key] = round(self._open.get(key, 0.0) + filled, 8)
+
     def get_mark_price(self, symbol: str) -> float:
-        """Get current mark price"""
+        """Get current mark price (reused for PRICE_CACHE_TTL seconds)"""
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < self.PRICE_CACHE_TTL:
+            return cached[1]
         try:
-            data = self.client.mark_price(symbol=symbol)
+            data = self._retry(self.client.mark_price, symbol=symbol)
             # Handle both single object and list responses
             if isinstance(data, list):
-                for item in data:
-                    if item['symbol'] == symbol:
-                        return float(item['markPrice'])
-                raise ValueError(f"Symbol {symbol} not found in response")
+                price = next(
+                    (float(item['markPrice']) for item in data if item['symbol'] == symbol),
+                    None
+                )
+                if price is None:
+                    raise ValueError(f"Symbol {symbol} not found in response")
             else:
-                return float(data['markPrice'])
+                price = float(data['markPrice'])
+            self._price_cache[symbol] = (time.monotonic(), price)
+            logger.debug("Mark price {}: {}", symbol, price)
+            return price
         except (ClientError, ServerError) as e:
             logger.error(f"Failed to get mark price: {e}")
             raise
+
+    def update_mark_price(self, symbol: str, price: float):
+        """
+        Store a mark price pushed by the WebSocket stream.
+
+        Shares the REST price cache, so get_mark_price_cached() can serve
+        streamed prices without an API call.
+        """
+        self._price_cache[symbol] = (time.monotonic(), price)
+
+    def peek_mark_price(self, symbol: str, max_age: float) -> Optional[float]:
+        """Cached mark price if younger than max_age seconds, else None"""
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        return None
+
+    def get_mark_price_cached(self, symbol: str, max_age: float = 2.0) -> float:
+        """
+        Mark price from the stream if fresh, otherwise from REST.
+
+        The markPrice@1s stream updates the cache every second, so with the
+        stream connected this never touches the API. max_age=2.0 rides
+        out one missed (or late) tick before falling back to REST.
+        """
+        price = self.peek_mark_price(symbol, max_age)
+        if price is not None:
+            return price
+        return self.get_mark_price(symbol)
     
     def set_leverage(self, symbol: str, leverage: int):
         """Set leverage for a symbol"""
@@ -157,27 +404,77 @@ class AsterExchangeClient:
     
     def set_position_mode(self, dual_side_position: bool):
         """Set position mode (hedge mode or one-way mode)"""
+        mode = "hedge" if dual_side_position else "one-way"
         try:
             result = self.client.change_position_mode(
                 dualSidePosition="true" if dual_side_position else "false"
             )
-            mode = "hedge" if dual_side_position else "one-way"
             logger.info(f"Position mode set to: {mode}")
             return result
+        except ClientError as e:
+            if e.error_code == -4059:  # No need to change position side
+                logger.debug(f"Position mode already {mode}")
+                return None
+            logger.error(f"Failed to set position mode: {e.error_code} - {e.error_message}")
+            raise
         except Exception as e:
             logger.error(f"Failed to set position mode: {e}")
             raise
 
-    def close_position(self, symbol: str, position_side: str) -> Dict[str, Any]:
-        """Close an entire position"""
+    def start_user_stream(self) -> str:
+        """Create a user-data stream and return its listenKey (valid 60 min)"""
+        return self._retry(self.client.new_listen_key)['listenKey']
+
+    def keepalive_user_stream(self, listen_key: str):
+        """Extend a user-data stream's listenKey for another 60 minutes"""
+        return self._retry(self.client.renew_listen_key, listen_key)
+
+    def tracked_quantity(self, symbol: str, position_side: str) -> Optional[float]:
+        """Size of a position we opened ourselves, or None if not tracked"""
+        return self._open.get((symbol, position_side)) or None
+
+    def close_tracked_position(self, symbol: str, position_side: str) -> Optional[Dict[str, Any]]:
+        """
+        Close a position using the size tracked by place_market_order.
+
+        Costs one order and no position lookup. Returns None if the size
+        isn't tracked, or was rejected (e.g. the position was changed
+        outside the bot) - the caller then falls back to
+        close_position_from_exchange().
+        """
+        known_qty = self.tracked_quantity(symbol, position_side)
+        if known_qty is None:
+            return None
+        try:
+            return self.place_market_order(
+                symbol=symbol,
+                side="SELL" if position_side == "LONG" else "BUY",
+                quantity=known_qty,
+                position_side=position_side,
+                reduce_only=True
+            )
+        except ClientError:
+            logger.warning(
+                f"Close with tracked size {known_qty} failed for {symbol} "
+                f"{position_side} - re-reading position from exchange"
+            )
+            self._open.pop((symbol, position_side), None)
+            return None
+
+    def close_position_from_exchange(self, symbol: str, position_side: str) -> Dict[str, Any]:
+        """
+        Close a position after asking the exchange for its size.
+
+        Costs a positionRisk lookup plus one order.
+        Returns {} if there is no open position on that side.
+        """
         positions = self.get_position_risk(symbol=symbol)
         for pos in positions:
             if pos['positionSide'] == position_side and float(pos['positionAmt']) != 0:
-                side = "SELL" if position_side == "LONG" else "BUY"
                 qty = abs(float(pos['positionAmt']))
                 return self.place_market_order(
                     symbol=symbol,
-                    side=side,
+                    side="SELL" if position_side == "LONG" else "BUY",
                     quantity=qty,
                     position_side=position_side,
                     reduce_only=True
@@ -185,3 +482,129 @@ class AsterExchangeClient:
         logger.warning(f"No open position found for {symbol} {position_side}")
         return {}
 
+    def close_position(self, symbol: str, position_side: str) -> Dict[str, Any]:
+        """
+        Close an entire position.
+
+        If we opened the position ourselves, its size is already known
+        (tracked by place_market_order) and no position lookup is needed.
+        Otherwise - or if the known size is rejected, e.g. because the
+        position was changed outside the bot - ask the exchange for it.
+        """
+        result = self.close_tracked_position(symbol, position_side)
+        if result is None:
+            result = self.close_position_from_exchange(symbol, position_side)
+        return result
+
+
+class AsyncAsterExchangeClient:
+    """
+    asyncio front-end for AsterExchangeClient.
+
+    Why?
+    A delta-neutral pair needs TWO orders (LONG + SHORT). With the blocking
+    client the SHORT waits for the LONG's full HTTP round-trip. Here each
+    call runs in a worker thread (asyncio.to_thread), so independent calls
+    can be awaited together:
+
+        client = AsyncAsterExchangeClient()
+        long_order, short_order = await asyncio.gather(
+            client.place_market_order("BTCUSDT", "BUY", 0.01, "LONG"),
+            client.place_market_order("BTCUSDT", "SELL", 0.01, "SHORT"),
+        )
+
+    Design notes:
+    - Wraps the sync client instead of re-implementing it, so signing,
+      caching, retries and logging behave exactly the same
+    - HMAC signing is CPU work and stays synchronous; only the blocking
+      network wait moves off the event loop
+    - The shared requests.Session connection pool serves concurrent calls
+    - Every call first takes its request weight from the client's
+      RateLimiter; when budget is short, orders and closes go first
+      (weights per Aster API docs: order 1, batch 5, positionRisk 5,
+      balance 5, mark price / leverage / position mode 1)
+    """
+
+    def __init__(self, client: Optional[AsterExchangeClient] = None):
+        """Wrap an existing client, or create one from settings"""
+        self.sync = client or AsterExchangeClient()
+        self.limiter = self.sync.rate_limiter
+
+    def close(self):
+        """Close pooled connections (call once on shutdown)"""
+        self.sync.close()
+
+    async def get_account_balance(self) -> Dict[str, Any]:
+        """Get account balance"""
+        await self.limiter.acquire(5, Priority.LOW)
+        return await asyncio.to_thread(self.sync.get_account_balance)
+
+    async def get_position_risk(self, symbol: Optional[str] = None) -> list:
+        """Get current positions"""
+        await self.limiter.acquire(5, Priority.NORMAL)
+        return await asyncio.to_thread(self.sync.get_position_risk, symbol)
+
+    async def place_market_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        position_side: str,
+        reduce_only: bool = False
+    ) -> Dict[str, Any]:
+        """Place a market order"""
+        await self.limiter.acquire(1, Priority.HIGH)
+        return await asyncio.to_thread(
+            self.sync.place_market_order, symbol, side, quantity, position_side, reduce_only
+        )
+
+    async def place_batch_market_orders(
+        self, orders: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Place several market orders in one request"""
+        await self.limiter.acquire(5, Priority.HIGH)
+        return await asyncio.to_thread(self.sync.place_batch_market_orders, orders)
+
+    async def get_mark_price(self, symbol: str) -> float:
+        """Get current mark price"""
+        await self.limiter.acquire(1, Priority.LOW)
+        return await asyncio.to_thread(self.sync.get_mark_price, symbol)
+
+    async def get_mark_price_cached(self, symbol: str, max_age: float = 2.0) -> float:
+        """Mark price from the stream if fresh (no thread hop), otherwise REST"""
+        price = self.sync.peek_mark_price(symbol, max_age)
+        if price is not None:
+            return price
+        await self.limiter.acquire(1, Priority.LOW)
+        return await asyncio.to_thread(self.sync.get_mark_price, symbol)
+
+    async def set_leverage(self, symbol: str, leverage: int):
+        """Set leverage for a symbol"""
+        await self.limiter.acquire(1, Priority.LOW)
+        return await asyncio.to_thread(self.sync.set_leverage, symbol, leverage)
+
+    async def set_position_mode(self, dual_side_position: bool):
+        """Set position mode (hedge mode or one-way mode)"""
+        await self.limiter.acquire(1, Priority.LOW)
+        return await asyncio.to_thread(self.sync.set_position_mode, dual_side_position)
+
+    async def close_position(self, symbol: str, position_side: str) -> Dict[str, Any]:
+        """
+        Close an entire position.
+
+        Same two paths as AsterExchangeClient.close_position, each taking
+        its own weight before it runs:
+        - tracked size → one order (1)
+        - otherwise → positionRisk lookup (5) + order (1)
+        """
+        if self.sync.tracked_quantity(symbol, position_side) is not None:
+            await self.limiter.acquire(1, Priority.HIGH)
+            result = await asyncio.to_thread(
+                self.sync.close_tracked_position, symbol, position_side
+            )
+            if result is not None:
+                return result
+        await self.limiter.acquire(6, Priority.HIGH)
+        return await asyncio.to_thread(
+            self.sync.close_position_from_exchange, symbol, position_side
+        )
@@ -0,0 +1,264 @@
+"""
+Aster WebSocket Streams - Push-based Position Tracking
+
+This module keeps an in-memory copy of our positions up to date using
+Aster's WebSocket streams, so the strategy doesn't need a REST call every
+cycle just to ask "what do I hold?".
+
+Two streams are combined on one connection:
+1. User-data stream (listenKey): ACCOUNT_UPDATE events whenever a position
+   changes (order fill, liquidation, manual trade on the website)
+2. Mark price stream (<symbol>@markPrice@1s): the current mark price
+
+Why both?
+ACCOUNT_UPDATE is only sent when a position CHANGES - its unrealized PnL
+field is not refreshed as the price moves. Risk checks need live PnL, so we
+recompute it from the mark price stream: (mark - entry) × positionAmt.
+
+Polling vs Streaming:
+- Polling: ask every N minutes, pay a 200-500 ms round-trip each time,
+  and miss anything that happens in between
+- Streaming: the exchange pushes changes to us the moment they happen
+- REST is still the source of truth - the stream seeds itself from REST
+  on every (re)connect, and the strategy re-reads REST every few cycles
+  as a safety net
+
+Stream Resources:
+- Aster Docs: https://github.com/asterdex/api-docs
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+import websockets
+from loguru import logger
+
+from aster_operator.exchange.aster_client import AsterExchangeClient
+from aster_operator.exchange.rate_limiter import Priority
+
+
+class PositionStreamer:
+    """
+    Maintains a live position snapshot for one symbol from WebSocket events.
+
+    The snapshot is "live" only while the connection is up, it has been
+    seeded from REST since the last (re)connect, and messages keep arriving.
+    Otherwise positions() returns None and callers fall back to REST.
+
+    Usage:
+        streamer = PositionStreamer(client, "BTCUSDT")
+        task = asyncio.create_task(streamer.run())
+        ...
+        positions = streamer.positions()
+        if positions is None:                     # not live → use REST
+            positions = client.get_position_risk(symbol="BTCUSDT")
+            streamer.seed(positions)
+    """
+
+    # listenKeys expire after 60 minutes without a keepalive
+    LISTEN_KEY_KEEPALIVE_SECONDS = 30 * 60
+
+    # The mark price stream ticks every second; silence for this long
+    # means the connection is probably dead even if the socket looks open
+    STALE_AFTER_SECONDS = 10.0
+
+    # Reconnect backoff: 1s, 2s, 4s ... capped at 60s
+    RECONNECT_MIN_DELAY = 1.0
+    RECONNECT_MAX_DELAY = 60.0
+
+    def __init__(self, client: AsterExchangeClient, symbol: str):
+        """
+        Parameters:
+            client: REST client (listenKey management and seeding)
+            symbol: Trading pair to track, e.g. "BTCUSDT"
+        """
+        self.client = client
+        self.symbol = symbol
+        self._ws_url = client._s.aster_ws_url
+
+        # Latest state, keyed by positionSide ("LONG" / "SHORT" / "BOTH")
+        # Fields use the same names as the REST positionRisk response so the
+        # rest of the bot doesn't care where the data came from
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._mark_price: Optional[float] = None
+
+        self._connected = False
+        self._seeded = False
+        self._last_message = 0.0  # time.monotonic() of last message
+
+        # Optional callback after each position / mark price update for our
+        # symbol. Runs inside the message loop (on the strategy's event loop),
+        # so it must not block.
+        self.on_update: Optional[Callable[[], None]] = None
+
+        # No lock: the stream runs as a task on the strategy's event loop,
+        # and nothing below awaits while reading or updating the snapshot,
+        # so each read/update is atomic with respect to the other tasks.
+
+    # ------------------------------------------------------------------
+    # Reading the snapshot
+    # ------------------------------------------------------------------
+
+    @property
+    def is_live(self) -> bool:
+        """True if the snapshot can be trusted without asking REST"""
+        return (
+            self._connected
+            and self._seeded
+            and time.monotonic() - self._last_message < self.STALE_AFTER_SECONDS
+        )
+
+    @property
+    def mark_price(self) -> Optional[float]:
+        """Latest mark price from the stream (None until the first tick)"""
+        return self._mark_price
+
+    def positions(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return positions in REST positionRisk format, or None if not live.
+
+        unRealizedProfit is recomputed from the latest mark price so that
+        risk checks see current PnL, not the value from the last fill.
+        """
+        if not self.is_live:
+            return None
+        mark = self._mark_price
+        snapshot = []
+        for pos in self._positions.values():
+            pos = dict(pos)
+            amt = float(pos['positionAmt'])
+            entry = float(pos['entryPrice'])
+            if mark is not None and amt != 0 and entry != 0:
+                pos['unRealizedProfit'] = (mark - entry) * amt
+                pos['markPrice'] = mark
+            snapshot.append(pos)
+        return snapshot
+
+    def seed(self, positions: List[Dict[str, Any]]):
+        """
+        Replace the snapshot with a fresh REST positionRisk response.
+
+        Called on startup, after reconnects (events may have been missed
+        while disconnected) and periodically as a consistency check.
+        """
+        self._positions = {
+            pos['positionSide']: {
+                'symbol': pos['symbol'],
+                'positionSide': pos['positionSide'],
+                'positionAmt': pos['positionAmt'],
+                'entryPrice': pos['entryPrice'],
+                'unRealizedProfit': pos.get('unRealizedProfit', 0),
+            }
+            for pos in positions
+            if pos.get('symbol', self.symbol) == self.symbol
+        }
+        self._seeded = True
+
+    def set_position(self, position_side: str, amount: float, entry_price: float):
+        """
+        Apply one of our own fills to the snapshot immediately.
+
+        ACCOUNT_UPDATE confirms it a moment later; until then, readers
+        would otherwise see the position as it was before our order.
+        """
+        self._positions[position_side] = {
+            'symbol': self.symbol,
+            'positionSide': position_side,
+            'positionAmt': amount,
+            'entryPrice': entry_price,
+            'unRealizedProfit': 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Running the stream
+    # ------------------------------------------------------------------
+
+    async def run(self):
+        """Connect and process messages forever, reconnecting on failure"""
+        delay = self.RECONNECT_MIN_DELAY
+        while True:
+            try:
+                await self._connect_once()
+                delay = self.RECONNECT_MIN_DELAY  # clean close → reset backoff
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Position stream disconnected: {e!r} (retry in {delay:.0f}s)")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+    async def _connect_once(self):
+        """One connection lifetime: subscribe, consume, clean up"""
+        listen_key = await asyncio.to_thread(self.client.start_user_stream)
+        streams = f"{listen_key}/{self.symbol.lower()}@markPrice@1s"
+        url = f"{self._ws_url}/stream?streams={streams}"
+
+        async with websockets.connect(url, ping_interval=60) as ws:
+            logger.info(f"📡 Position stream connected ({self.symbol})")
+            # Anything may have happened while we were offline - reseed
+            # from REST before going live. We're already subscribed, so
+            # events sent meanwhile wait on the socket and apply on top.
+            await self.client.rate_limiter.acquire(5, Priority.NORMAL)
+            self.client.invalidate_positions(self.symbol)
+            self.seed(await asyncio.to_thread(self.client.get_position_risk, self.symbol))
+            self._connected = True
+            keepalive = asyncio.create_task(self._keepalive(listen_key))
+            try:
+                async for raw in ws:
+                    self._last_message = time.monotonic()
+                    if not self._handle(orjson.loads(raw)):
+                        break
+            finally:
+                keepalive.cancel()
+                # The snapshot goes stale once we stop receiving events
+                self._connected = False
+                self._seeded = False
+
+    async def _keepalive(self, listen_key: str):
+        """Renew the listenKey periodically so the stream stays open"""
+        while True:
+            await asyncio.sleep(self.LISTEN_KEY_KEEPALIVE_SECONDS)
+            await asyncio.to_thread(self.client.keepalive_user_stream, listen_key)
+
+    def _handle(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply one stream message to the snapshot.
+
+        Returns:
+            False if the connection must be re-established, True otherwise
+        """
+        data = message.get('data', message)
+        event = data.get('e')
+        updated = False
+
+        if event == 'markPriceUpdate':
+            if data['s'] == self.symbol:
+                self._mark_price = float(data['p'])
+                # Also feed the client's price cache → no REST call on open
+                self.client.update_mark_price(self.symbol, self._mark_price)
+                updated = True
+
+        elif event == 'ACCOUNT_UPDATE':
+            # Only positions that changed are included
+            for p in data['a'].get('P', []):
+                if p['s'] != self.symbol:
+                    continue
+                self._positions[p['ps']] = {
+                    'symbol': p['s'],
+                    'positionSide': p['ps'],
+                    'positionAmt': p['pa'],
+                    'entryPrice': p['ep'],
+                    'unRealizedProfit': p['up'],
+                }
+                updated = True
+
+        elif event == 'listenKeyExpired':
+            logger.warning("listenKey expired - reconnecting position stream")
+            return False
+
+        if updated and self.on_update is not None:
+            self.on_update()
+        return True
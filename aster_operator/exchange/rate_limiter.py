@@ -0,0 +1,140 @@
+"""
+Request Rate Limiter - Token Bucket with Priorities
+
+Aster (like Binance) limits every API key/IP by REQUEST WEIGHT per minute.
+Each endpoint costs a fixed weight (e.g. an order = 1, positionRisk = 5),
+and going over the limit returns HTTP 429 and temporarily blocks you.
+
+Why limit on our side?
+- A 429 means backoff: seconds of waiting, possibly missing a rotation
+- Throttling ourselves BEFORE the exchange does is always cheaper
+- When budget is tight, the calls that matter (orders, closes) should
+  go first and price/position reads should wait
+
+How a token bucket works:
+- The bucket holds up to `capacity` tokens (= weight per minute)
+- Tokens refill continuously at capacity / 60 per second
+- A request of weight W takes W tokens, or waits until W are available
+- Waiting requests are served by priority (HIGH before NORMAL before LOW),
+  then first-come-first-served
+
+Exchange feedback:
+Every response carries X-MBX-USED-WEIGHT-1M (weight used this minute,
+including other bots/scripts on the same key). observe_used_weight()
+lowers our bucket to match, so the local estimate never runs ahead of
+the exchange's count.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import List, Optional, Tuple
+
+from loguru import logger
+
+
+class Priority(IntEnum):
+    """Lower value = served first"""
+    HIGH = 0     # Orders and closes - delays here cost money
+    NORMAL = 1   # Position reads
+    LOW = 2      # Prices, balances, housekeeping
+
+
+class RateLimiter:
+    """
+    Async token bucket with a priority wait queue.
+
+    Usage:
+        limiter = RateLimiter(weight_per_minute=2400)
+        await limiter.acquire(weight=5, priority=Priority.NORMAL)
+        ... make the request ...
+    """
+
+    def __init__(self, weight_per_minute: int, safety_margin: float = 0.9):
+        """
+        Parameters:
+            weight_per_minute: Exchange limit for request weight per minute
+            safety_margin: Fraction of the limit we allow ourselves to use
+                           (leaves headroom for clock skew and other clients)
+        """
+        self.capacity = weight_per_minute * safety_margin
+        self._refill_per_second = self.capacity / 60
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+        # Waiters: (priority, arrival order, weight, future)
+        self._queue: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._drainer: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+        # observe_used_weight() is called from HTTP worker threads
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last update (caller holds _lock)"""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self._refill_per_second
+        )
+        self._updated = now
+
+    def _try_take(self, weight: int) -> bool:
+        """Take weight tokens if available"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= weight:
+                self._tokens -= weight
+                return True
+            return False
+
+    async def acquire(self, weight: int = 1, priority: Priority = Priority.NORMAL):
+        """Wait until `weight` tokens are available, respecting priority"""
+        # Fast path: nobody waiting and enough budget → no queueing at all
+        if not self._queue and self._try_take(weight):
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), weight, future))
+        self._wakeup.set()
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        await future
+
+    async def _drain(self):
+        """Hand out tokens to queued waiters in priority order"""
+        while self._queue:
+            _, _, weight, future = self._queue[0]
+            if future.cancelled():
+                heapq.heappop(self._queue)
+                continue
+            if self._try_take(weight):
+                heapq.heappop(self._queue)
+                future.set_result(None)
+                continue
+
+            # Sleep until the head request can be served, but wake early
+            # if a new (possibly higher-priority) request arrives
+            with self._lock:
+                deficit = weight - self._tokens
+            delay = max(deficit / self._refill_per_second, 0.01)
+            logger.debug("Rate limit: waiting {:.2f}s for {} weight", delay, weight)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def observe_used_weight(self, used: int):
+        """
+        Sync with the exchange's count from X-MBX-USED-WEIGHT-1M.
+
+        Only ever lowers the bucket: if the exchange says we've used more
+        than we think (other clients, missed calls), trust the exchange.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, self.capacity - used)
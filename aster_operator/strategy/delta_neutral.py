@@ -35,16 +35,36 @@ Example:
 """
 
 from loguru import logger
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-import time
+from datetime import datetime, timezone
+from pathlib import Path
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Set, Tuple
+import asyncio
 import random
+import time
+
+import numpy as np
+import orjson
+from sqlalchemy import case, func
 
 from aster_operator.config.settings import settings
-from aster_operator.exchange.aster_client import AsterExchangeClient
+from aster_operator.exchange.aster_client import AsyncAsterExchangeClient
+from aster_operator.exchange.aster_stream import PositionStreamer
 from aster_operator.strategy.risk_manager import RiskManager
-from aster_operator.database.db import get_db
-from aster_operator.database.models import Trade, Position
+from aster_operator.strategy.position_book import PositionBook
+from aster_operator.database.db import bulk_insert_trades, get_db, refresh_daily_stats
+from aster_operator.database.models import DailyStats, Trade, Position
+from aster_operator.utils import metrics
+
+
+# executedQty / avgPrice pulled out of an order response in one C-level call
+_FILL_FIELDS = itemgetter('executedQty', 'avgPrice')
+
+
+def _parse_fill(order: Dict) -> Tuple[float, float, float, float]:
+    """Order response → (quantity, fill price, notional, commission) as floats"""
+    qty, price = map(float, _FILL_FIELDS(order))
+    return qty, price, qty * price, float(order.get('commission', 0))
 
 
 class DeltaNeutralStrategy:
@@ -61,10 +81,13 @@ class DeltaNeutralStrategy:
     4. Log all activity to database
     5. Report daily statistics
 
-    Lifecycle:
-    - Bot calls run_cycle() every 10 minutes
-    - Each cycle: check positions → take action → log stats
-    - Actions: open new, hold existing, or rotate
+    Lifecycle (event-driven):
+    - Bot awaits start() once
+    - Rotation: a timer armed when the pair opens
+    - Risk checks: on every WebSocket position / mark price update
+    - Daily stats: logged every STATS_INTERVAL_SECONDS
+    - run_cycle() every 10 minutes is a heartbeat: REST safety net when
+      the stream is down, and opens a pair when none is held
     - Never hold more than 1 pair at a time (LONG + SHORT)
 
     Design Philosophy:
@@ -72,6 +95,21 @@ class DeltaNeutralStrategy:
     - Safe over profitable (risk management > aggressive trading)
     - Transparent over opaque (log everything for learning)
     """
+
+    # Even while the WebSocket snapshot is live, re-read positions over REST
+    # every N cycles as a consistency check (6 cycles ≈ 1 hour)
+    REST_RESYNC_EVERY_N_CYCLES = 6
+
+    # Last exchange configuration we applied (leverage, hedge mode), so a
+    # restart can skip the two setup calls if nothing has changed
+    EXCHANGE_CONFIG_CACHE_PATH = Path("~/.aster_operator/exchange_config.json")
+    EXCHANGE_CONFIG_TTL_SECONDS = 24 * 60 * 60
+
+    # Extra seconds added to the minimum hold time before rotating
+    ROTATION_JITTER_SECONDS = (1.0, 10.0)
+
+    # How often the daily statistics are logged
+    STATS_INTERVAL_SECONDS = 5 * 60
     
     def __init__(self):
         """
@@ -81,8 +119,68 @@ class DeltaNeutralStrategy:
         1. Create Aster API client (handles all exchange communication)
         2. Create risk manager (handles position sizing and limits)
         3. Set trading pair (currently only first pair is used)
-        4. Configure leverage and position mode on exchange
-        5. Initialize strategy state tracking
+        4. Initialize strategy state tracking
+
+        Nothing here talks to the exchange - that happens in start(),
+        which must be awaited from inside the running event loop.
+
+        State Tracking:
+        - active_positions: Current open positions {LONG: {...}, SHORT: {...}}
+        - last_rotation_time: When we last rotated (not currently used)
+        """
+        # Initialize exchange client (async API wrapper)
+        # Every call runs in a worker thread, so the event loop stays free
+        # for the WebSocket stream while we wait on HTTP responses
+        self.client = AsyncAsterExchangeClient()
+
+        # Initialize risk manager (position sizing, stop-loss, etc.)
+        self.risk_manager = RiskManager(self.client)
+
+        # Select trading pair from config (currently only uses first one)
+        # Future: Could trade multiple pairs simultaneously
+        self.symbol = settings.trading_pairs[0]  # e.g., "BTCUSDT"
+
+        # Settings used on every open/rotation, read once
+        # (settings are frozen - they can't change while the bot runs)
+        self._leverage = settings.leverage
+        self._hold_min = settings.position_hold_time_min
+        self._base_asset = self.symbol[:3]  # "BTC" - for log messages
+
+        # Initialize strategy state tracking
+        # This dictionary tracks our currently open positions
+        # Format: {"LONG": {opened_at: datetime, opened_monotonic: float,
+        #                   is_active: bool, ...},
+        #          "SHORT": {...}}
+        # opened_at (UTC wall clock) is for records and logs; hold times use
+        # opened_monotonic, which can't jump when the system clock is adjusted
+        self.active_positions: Dict[str, Dict] = {}
+
+        # Track when we last rotated positions (not currently used)
+        # Future feature: Prevent rotating too frequently
+        self.last_rotation_time: Optional[datetime] = None
+
+        # Live position snapshot pushed by Aster's WebSocket streams
+        # Replaces a REST round-trip per cycle; REST stays as the fallback
+        self.streamer = PositionStreamer(self.client.sync, self.symbol)
+        self._stream_task: Optional[asyncio.Task] = None
+        self._cycles_since_resync = 0
+
+        # Rotation is scheduled the moment a pair opens (see _schedule_rotation)
+        # The lock keeps the timer and run_cycle from trading at the same time
+        self._rotation_handle: Optional[asyncio.TimerHandle] = None
+        self._rotation_task: Optional[asyncio.Task] = None
+        self._stats_task: Optional[asyncio.Task] = None
+        self._risk_task: Optional[asyncio.Task] = None
+        self._trade_lock = asyncio.Lock()
+
+        # Legs whose risk close failed - still open, retried on the next
+        # reconcile even if they no longer breach a limit themselves
+        self._failed_closes: Set[str] = set()
+        self._config_cache_path = self.EXCHANGE_CONFIG_CACHE_PATH.expanduser()
+
+    async def start(self, force_reconfigure: bool = False):
+        """
+        Configure the exchange and start the position stream.
 
         Exchange Configuration:
         - Leverage: From settings (default 15x)
@@ -94,76 +192,131 @@ class DeltaNeutralStrategy:
         In hedge mode: Can be LONG *and* SHORT simultaneously
         Delta-neutral requires hedge mode!
 
-        State Tracking:
-        - active_positions: Current open positions {LONG: {...}, SHORT: {...}}
-        - last_rotation_time: When we last rotated (not currently used)
+        Why cache the configuration?
+        Leverage and position mode rarely change, but setting them costs two
+        REST calls per restart (and the exchange errors if they're already
+        set). The last applied values are saved to EXCHANGE_CONFIG_CACHE_PATH
+        and reused for EXCHANGE_CONFIG_TTL_SECONDS. The TTL still catches
+        changes made on the exchange UI eventually; use
+        force_reconfigure=True (main.py --force-reconfigure) to apply now.
+
+        The WebSocket stream runs as a task on the same event loop as the
+        strategy, so heartbeats and position updates keep flowing while a
+        cycle is waiting on the exchange. Each update triggers a risk check
+        (see _on_stream_update), and a second task logs daily stats.
+
+        Parameters:
+            force_reconfigure: Ignore the cached configuration and set
+                leverage/position mode on the exchange again
         """
-        # Initialize exchange client (API wrapper)
-        self.client = AsterExchangeClient()
+        if not force_reconfigure and self._exchange_config_is_cached():
+            logger.info(
+                f"✅ Exchange already configured: {self._leverage}x leverage, "
+                f"hedge mode for {self.symbol} (cached)"
+            )
+        else:
+            await self._configure_exchange()
 
-        # Initialize risk manager (position sizing, stop-loss, etc.)
-        self.risk_manager = RiskManager()
+        self.streamer.on_update = self._on_stream_update
+        self._stream_task = asyncio.create_task(
+            self.streamer.run(), name="position-stream"
+        )
+        self._stats_task = asyncio.create_task(self._stats_loop(), name="daily-stats")
 
-        # Select trading pair from config (currently only uses first one)
-        # Future: Could trade multiple pairs simultaneously
-        self.symbol = settings.trading_pairs[0]  # e.g., "BTCUSDT"
+        logger.info(f"🚀 Delta-Neutral Strategy initialized for {self.symbol}")
 
-        # Configure exchange settings (leverage and position mode)
-        # These only need to be set once, but we set them on each startup
-        # to ensure they're correct (in case user changed them on exchange UI)
+    async def _configure_exchange(self):
+        """Set leverage and hedge mode on the exchange, then cache them"""
         try:
             # Set leverage (e.g., 15x)
             # This tells exchange how much buying power we get
             # 15x = $1 margin controls $15 notional
-            self.client.set_leverage(self.symbol, settings.leverage)
+            await self.client.set_leverage(self.symbol, self._leverage)
 
             # Set position mode to HEDGE MODE (critical for delta-neutral!)
             # True = hedge mode (can have LONG + SHORT simultaneously)
             # False = one-way mode (can only have LONG *or* SHORT)
-            self.client.set_position_mode(True)
+            await self.client.set_position_mode(True)
 
             logger.info(
-                f"✅ Exchange configured: {settings.leverage}x leverage, "
+                f"✅ Exchange configured: {self._leverage}x leverage, "
                 f"hedge mode enabled for {self.symbol}"
             )
+            self._save_exchange_config()
         except Exception as e:
-            # If this fails, it's usually because settings are already correct
-            # Exchange returns error if you try to set leverage to same value
+            # "Already set" answers (-4046, -4059) count as success in the
+            # client and are cached above - this is a real failure, so
+            # nothing is cached and the next start tries again
             logger.warning(
                 f"Could not set leverage/position mode: {e}. "
-                f"This is usually OK - settings may already be correct."
+                f"Check them on the exchange - continuing with current settings."
             )
-            # Continue anyway - bot will still work if settings are already correct
 
-        # Initialize strategy state tracking
-        # This dictionary tracks our currently open positions
-        # Format: {"LONG": {opened_at: datetime, is_active: bool, ...},
-        #          "SHORT": {opened_at: datetime, is_active: bool, ...}}
-        self.active_positions: Dict[str, Dict] = {}
+    def _exchange_config(self) -> Dict[str, Any]:
+        """The configuration this run wants on the exchange"""
+        return {"symbol": self.symbol, "leverage": self._leverage, "position_mode": True}
 
-        # Track when we last rotated positions (not currently used)
-        # Future feature: Prevent rotating too frequently
-        self.last_rotation_time: Optional[datetime] = None
+    def _exchange_config_is_cached(self) -> bool:
+        """True if the cache file matches our configuration and is within TTL"""
+        try:
+            cached = orjson.loads(self._config_cache_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return False  # No cache yet, or unreadable → configure normally
 
-        logger.info(f"🚀 Delta-Neutral Strategy initialized for {self.symbol}")
+        if time.time() - cached.get("ts", 0) > self.EXCHANGE_CONFIG_TTL_SECONDS:
+            return False
+        return all(cached.get(k) == v for k, v in self._exchange_config().items())
+
+    def _save_exchange_config(self):
+        """Record the configuration we just applied (best effort)"""
+        try:
+            self._config_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._config_cache_path.write_bytes(
+                orjson.dumps({**self._exchange_config(), "ts": time.time()})
+            )
+        except OSError as e:
+            logger.warning(f"Could not write exchange config cache: {e}")
+
+    async def stop(self):
+        """Stop the stream, timers and in-flight checks, close connections (call on shutdown)"""
+        self._cancel_rotation()
+        self.streamer.on_update = None
+        tasks = [
+            task for task in (self._stream_task, self._stats_task,
+                              self._risk_task, self._rotation_task)
+            if task is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        # Wait for them to finish BEFORE closing the client they use;
+        # return_exceptions=True: a task that already failed can't abort shutdown
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._stream_task = self._stats_task = None
+        self._risk_task = self._rotation_task = None
+        self.client.close()
     
-    def run_cycle(self):
+    async def run_cycle(self):
         """
-        Main strategy loop - executed every 10 minutes by the bot.
+        Heartbeat - executed every 10 minutes by the bot.
+
+        Most work is event-driven and does NOT wait for this:
+        - Rotation: timer armed when the pair opens (_schedule_rotation)
+        - Risk checks: every stream update (_on_stream_update)
+        - Daily stats: their own timer (_stats_loop)
 
-        This is the HEART of the strategy. Each cycle follows this flow:
+        The heartbeat is the safety net and the "start trading" trigger:
 
-        1. **Check Positions**: Get current state from exchange
+        1. **Check Positions**: Get current state and run the risk checks
+           (REST if the stream is down or a periodic resync is due)
         2. **Risk Management**: Close any positions exceeding risk limits
         3. **Decision**: Decide action based on current state
            - No positions? → Open new delta-neutral pair
-           - Positions held long enough? → Rotate (close + reopen)
            - Otherwise? → Hold and wait
-        4. **Log Stats**: Record daily performance metrics
 
         Cycle Frequency:
         - Default: Every 10 minutes (600 seconds)
-        - Why 10 minutes? Balance between responsiveness and API rate limits
+        - Only matters when the stream is down (risk checks) or after all
+          positions were closed by a risk check (reopen)
         - You can adjust in main.py (cycle_interval_seconds)
 
         State Machine:
@@ -183,73 +336,130 @@ class DeltaNeutralStrategy:
         logger.info("=" * 50)
         logger.info("🔄 Running strategy cycle...")
 
-        try:
-            # ============================================================
-            # STEP 1: Get current positions from exchange
-            # ============================================================
-            # This API call returns all open positions for this symbol
-            # Even if we think positions are closed, always check with exchange
-            # (API is source of truth, not our internal state)
-            positions = self.client.get_position_risk(symbol=self.symbol)
-
-            # Update our internal tracking based on exchange reality
-            # If exchange shows position closed but we think it's open, sync it
-            self._update_active_positions(positions)
-
-            # ============================================================
-            # STEP 2: Risk management check
-            # ============================================================
-            # Before doing anything else, check if any positions are risky
-            # Close immediately if:
-            # - PnL drift exceeds threshold (delta-neutrality broken)
-            # - Stop-loss triggered (losses exceed limit)
-            self._check_and_close_risky_positions(positions)
-
-            # ============================================================
-            # STEP 3: Decide what to do this cycle
-            # ============================================================
-            # Three possible actions:
-            # A) Open new positions (if we have none)
-            # B) Rotate positions (if held long enough)
-            # C) Hold and wait (if not ready to rotate)
-
-            if self._should_open_new_positions():
-                # No active positions → Open new delta-neutral pair
-                self._open_delta_neutral_pair()
-
-            elif self._should_rotate_positions():
-                # Held for 90+ minutes → Close and reopen with variations
-                self._rotate_positions()
-
-            else:
-                # Not ready to rotate → Just hold and monitor
-                logger.info("⏳ Holding current positions...")
-                self._log_position_status()
-
-            # ============================================================
-            # STEP 4: Log daily statistics
-            # ============================================================
-            # After every cycle, update and log today's metrics
-            # - Total volume traded
-            # - Number of trades
-            # - PnL and fees
-            # - Estimated reward points
-            self._log_daily_stats()
-
-        except Exception as e:
-            # If anything goes wrong, log it and re-raise
-            # Main loop in main.py will catch this and retry
-            logger.error(f"❌ Strategy cycle error: {e}")
-            logger.exception("Full traceback:")  # Log stack trace for debugging
-            raise
+        # Never overlap with a timer-driven rotation (see _schedule_rotation)
+        async with self._trade_lock:
+            try:
+                # ============================================================
+                # STEP 1: Get current positions from exchange + risk checks
+                # ============================================================
+                # Usually served from the WebSocket snapshot (no API call).
+                # Falls back to REST when the stream is down or due a resync.
+                # Even if we think positions are closed, always check with exchange
+                # (exchange is source of truth, not our internal state)
+                # All risk checks run once, vectorized (evaluate_all):
+                # - close_mask: positions over the stop-loss / drift limits
+                # - can_open: whether a new pair fits the exposure limit
+                positions, price, close_mask, can_open = await self._assess_positions()
+
+                # ============================================================
+                # STEP 2: Sync tracking + risk management (one pass)
+                # ============================================================
+                # If exchange shows position closed but we think it's open, sync it.
+                # Before doing anything else, close risky positions immediately:
+                # - PnL drift exceeds threshold (delta-neutrality broken)
+                # - Stop-loss triggered (losses exceed limit)
+                await self._reconcile_positions(positions, self.risk_manager.book, close_mask)
+
+                # ============================================================
+                # STEP 3: Decide what to do this cycle
+                # ============================================================
+                # Two possible actions:
+                # A) Open new positions (if we have none)
+                # B) Hold and wait (the rotation timer handles the rest)
+
+                if self._should_open_new_positions(can_open):
+                    # No active positions → Open new delta-neutral pair
+                    await self._open_delta_neutral_pair(price)
+
+                else:
+                    # Rotation timer is pending → Just hold and monitor
+                    logger.info("⏳ Holding current positions...")
+                    self._log_position_status()
+
+            except Exception as e:
+                # If anything goes wrong, log it and re-raise
+                # Main loop in main.py will catch this and retry
+                logger.error(f"❌ Strategy cycle error: {e}")
+                logger.exception("Full traceback:")  # Log stack trace for debugging
+                raise
     
-    def _should_open_new_positions(self) -> bool:
+    def _on_stream_update(self):
+        """
+        Stream callback: re-run the risk check on fresh position/price data.
+
+        Called from the stream's message loop, so it must not block - it
+        only starts a task. If a check is already pending (e.g. waiting for
+        a rotation to finish), that one will see the newest data anyway.
+        """
+        if self._risk_task is None or self._risk_task.done():
+            self._risk_task = asyncio.create_task(self._risk_check_from_stream())
+
+    async def _risk_check_from_stream(self):
+        """Risk check on the live snapshot (no REST call)"""
+        async with self._trade_lock:
+            positions = self.streamer.positions()
+            if positions is None:
+                return  # Not live - the heartbeat covers it over REST
+            try:
+                book = self.risk_manager.book.load(positions)
+                close_mask, _ = self.risk_manager.evaluate_all(book)
+                await self._reconcile_positions(positions, book, close_mask)
+            except Exception as e:
+                logger.error(f"Stream risk check failed: {e}")
+
+    async def _stats_loop(self):
+        """Log daily statistics every STATS_INTERVAL_SECONDS"""
+        while True:
+            await asyncio.sleep(self.STATS_INTERVAL_SECONDS)
+            try:
+                self._log_daily_stats(datetime.now(timezone.utc))
+            except Exception as e:
+                logger.error(f"Daily stats failed: {e}")
+
+    async def _assess_positions(
+        self,
+    ) -> Tuple[List[Dict], Optional[float], np.ndarray, bool]:
+        """
+        Current positions for our symbol plus the risk verdict on them.
+
+        Prefers the live stream: the snapshot is evaluated in place
+        (RiskManager.evaluate_all) with no API call, and price is None -
+        the mark price comes from the stream when a pair is opened.
+
+        Uses REST (and reseeds the stream snapshot) when:
+        - the stream isn't connected / hasn't been seeded yet
+        - the stream has gone quiet (possible silent disconnect)
+        - REST_RESYNC_EVERY_N_CYCLES cycles have passed since the last REST read
+        RiskManager.evaluate() then fetches positions and mark price
+        concurrently, so the price is ready if we open a pair.
+
+        Returns:
+            (positions, price, close_mask, can_open) - see RiskManager.evaluate
+        """
+        if self._cycles_since_resync < self.REST_RESYNC_EVERY_N_CYCLES:
+            positions = self.streamer.positions()
+            if positions is not None:
+                self._cycles_since_resync += 1
+                logger.debug("Positions served from WebSocket snapshot")
+                close_mask, can_open = self.risk_manager.evaluate_all(
+                    self.risk_manager.book.load(positions)
+                )
+                return positions, None, close_mask, can_open
+
+        positions, price, close_mask, can_open = await self.risk_manager.evaluate(self.symbol)
+        self.streamer.seed(positions)
+        self._cycles_since_resync = 0
+        return positions, price, close_mask, can_open
+
+    def _should_open_new_positions(self, can_open: bool = True) -> bool:
         """
         Decide if we should open new delta-neutral positions.
 
         Open new positions when:
         - We have no active positions currently
         - All previous positions have been closed
+        - The risk manager's exposure check allows it (can_open, from
+          RiskManager.evaluate_all)
 
         Why this check?
         - Strategy only holds ONE pair at a time (LONG + SHORT)
@@ -268,92 +478,89 @@ class DeltaNeutralStrategy:
         if not self.active_positions:
             # Empty dict = no positions ever opened
             logger.debug("No positions in tracking → ready to open new")
-            return True
+        else:
+            # Check if all tracked positions are inactive
+            # Sometimes we have position entries but they're marked inactive
+            all_inactive = all(
+                not pos.get('is_active', False)
+                for pos in self.active_positions.values()
+            )
 
-        # Check if all tracked positions are inactive
-        # Sometimes we have position entries but they're marked inactive
-        all_inactive = all(
-            not pos.get('is_active', False)
-            for pos in self.active_positions.values()
-        )
+            if not all_inactive:
+                # We have at least one active position → don't open new
+                logger.debug("Active positions exist → not opening new")
+                return False
 
-        if all_inactive:
             logger.debug("All tracked positions are inactive → ready to open new")
-            return True
 
-        # We have at least one active position → don't open new
-        logger.debug("Active positions exist → not opening new")
-        return False
+        # Ready to open - as long as the new pair fits the exposure limit
+        # (e.g. positions we don't track, opened manually on the website)
+        if not can_open:
+            logger.warning("❌ Not opening new pair: would exceed safe exposure limits")
+            return False
 
-    def _should_rotate_positions(self) -> bool:
-        """
-        Decide if it's time to rotate (close and reopen) positions.
+        return True
 
-        Rotate when:
-        1. We have active positions, AND
-        2. ALL positions have been held for minimum time (90+ minutes)
+    def _schedule_rotation(self):
+        """
+        Arm a timer that rotates the pair once the minimum hold time passes.
 
-        Why rotate?
-        - Generate more volume (volume = reward points)
-        - Get fresh positions with new hold time counters
-        - Small variations prevent wash trading detection
+        Why a timer instead of checking every cycle?
+        - run_cycle only fires every 10 minutes, so a position reaching 90
+          minutes just after a cycle would wait up to 10 more minutes
+        - The timer fires right at eligibility - no wasted hold time, and
+          no extra API calls
 
         Why wait 90+ minutes?
         - Aster gives 10x multiplier for holds >=90 min
         - Holding <90 min gives only 1x multiplier
         - Rotating early sacrifices 90% of potential rewards!
 
-        Returns:
-            True if all positions ready to rotate, False otherwise
+        The delay includes a few random seconds: a safety margin so the
+        exchange's own hold time is surely past the threshold, and so
+        rotations don't happen at perfectly regular intervals.
 
         Example timeline:
-        - 0 min: Open positions
-        - 10 min: Check → NO (only held 10 min, need 90)
-        - 20 min: Check → NO (only held 20 min, need 90)
-        - ...
-        - 90 min: Check → YES! (held 90 min, ready to rotate)
-        - Rotate: Close old, open new
-        - 0 min: New positions opened, timer resets
+        - 0 min: Open positions → timer armed for ~90 min
+        - 10, 20, ... 80 min: run_cycle checks risk, holds
+        - 90 min: Timer fires → close old, open new → timer re-armed
         """
-        # Safety check: If no positions, can't rotate
-        if not self.active_positions:
-            logger.debug("No positions to rotate")
-            return False
-
-        # Check each position's hold time
-        # ALL positions must meet minimum hold time before we rotate
-        # (Usually we only have 2: LONG and SHORT, opened simultaneously)
-        for position_side, pos_data in self.active_positions.items():
-            # Skip inactive positions (already closed)
-            if not pos_data.get('is_active'):
-                continue
-
-            # Get when this position was opened
-            opened_at = pos_data.get('opened_at')
-            if not opened_at:
-                # Missing timestamp? Can't calculate hold time
-                # Log warning and skip (shouldn't happen)
-                logger.warning(f"Position {position_side} missing opened_at timestamp")
-                continue
-
-            # Calculate how long we've held this position
-            hold_time = datetime.utcnow() - opened_at
-            hold_time_minutes = hold_time.total_seconds() / 60
-
-            # Check if this position has met minimum hold time
-            if hold_time_minutes < settings.position_hold_time_min:
-                # Not held long enough yet
-                logger.info(
-                    f"⏰ Position {position_side} held for {hold_time_minutes:.1f} min, "
-                    f"need {settings.position_hold_time_min} min (waiting {settings.position_hold_time_min - hold_time_minutes:.1f} more min)"
+        self._cancel_rotation()
+        delay = self._hold_min * 60 + random.uniform(*self.ROTATION_JITTER_SECONDS)
+        self._rotation_handle = asyncio.get_running_loop().call_later(
+            delay, self._start_rotation_task
+        )
+        logger.opt(lazy=True).info("⏰ Rotation scheduled in {:.1f} min", lambda: delay / 60)
+
+    def _cancel_rotation(self):
+        """Disarm the rotation timer (positions were closed another way)"""
+        if self._rotation_handle is not None:
+            self._rotation_handle.cancel()
+            self._rotation_handle = None
+
+    def _start_rotation_task(self):
+        """Timer callback - call_later can't await, so hand off to a task"""
+        self._rotation_handle = None
+        # Keep a reference so the task isn't garbage-collected mid-rotation
+        self._rotation_task = asyncio.create_task(self._rotate_on_timer())
+
+    async def _rotate_on_timer(self):
+        """Rotate from the timer, retrying in a minute if it fails"""
+        async with self._trade_lock:
+            if not any(p.get('is_active') for p in self.active_positions.values()):
+                # Closed by a risk check while the timer was pending
+                logger.debug("Rotation timer fired with no active positions")
+                return
+            try:
+                await self._rotate_positions()
+            except Exception:
+                # Nothing else will rotate these positions - try again later
+                logger.info("Retrying rotation in 60 seconds...")
+                self._rotation_handle = asyncio.get_running_loop().call_later(
+                    60, self._start_rotation_task
                 )
-                return False  # Not ready yet
-
-        # If we get here, ALL active positions have been held long enough
-        logger.info("✅ All positions held for minimum time - ready to rotate!")
-        return True
     
-    def _open_delta_neutral_pair(self):
+    async def _open_delta_neutral_pair(self, price: Optional[float] = None):
         """
         Open equal LONG and SHORT positions simultaneously (delta-neutral).
 
@@ -366,11 +573,10 @@ class DeltaNeutralStrategy:
         1. Get current mark price from exchange
         2. Calculate safe position size using risk manager
         3. Add randomization to avoid wash trading detection
-        4. Place LONG market order
-        5. Wait 2-5 seconds (appear natural, not bot-like)
-        6. Place SHORT market order
-        7. Record both positions in database
-        8. Update internal state tracking
+        4. Place LONG + SHORT market orders in one batch request
+        5. Verify both legs filled (undo a lone leg)
+        6. Record both positions in database
+        7. Update internal state tracking
 
         Why use mark price (not last price)?
         - Mark price = smoothed index price + funding rate
@@ -383,15 +589,24 @@ class DeltaNeutralStrategy:
         - Prevents exact matching (wash trading red flag)
         - Still maintains approximate delta-neutrality
 
-        Why delay between orders?
-        - Natural trading behavior (humans don't place orders instantly)
-        - Prevents exchange from flagging as bot
-        - 2-5 second random delay
+        Why one batch request (no delay between legs)?
+        - Earlier versions slept 2-5 seconds between LONG and SHORT
+        - Every second between legs lets the price drift → entry mismatch
+        - Batch = one round-trip, both legs fill together
+        - The ±5% quantity randomization still varies every pair, and
+          each order carries a random client order ID ("aop-<uuid>")
+        - Timing still varies: rotations fire at hold time + a few random
+          seconds, and wait 5-10s between closing and reopening
 
         Risk Considerations:
         - Both orders are market orders (instant fill, higher fees)
-        - Price might move between LONG and SHORT orders
+        - Fills can still differ slightly (slippage, partial book depth)
         - This creates small entry price mismatch (why we track drift)
+        - One leg can be rejected while the other fills (handled in step 5)
+
+        Parameters:
+            price: Mark price the caller already has (run_cycle's REST
+                   check fetches one); None = fetch it here
 
         Returns:
             None (modifies self.active_positions state)
@@ -406,8 +621,10 @@ class DeltaNeutralStrategy:
         # ================================================================
         # Use mark price (not last price) for more stable reference
         # Mark price = exchange's fair price calculation
-        price = self.client.get_mark_price(self.symbol)
-        logger.info(f"Current mark price: ${price:,.2f}")
+        # Served from the WebSocket stream when fresh (<1s), else REST
+        if price is None:
+            price = await self.client.get_mark_price_cached(self.symbol)
+        logger.info("Current mark price: ${:,.2f}", price)
 
         # ================================================================
         # STEP 2: Calculate position size
@@ -425,122 +642,84 @@ class DeltaNeutralStrategy:
         # Example: 0.01 BTC → random between 0.0095 - 0.0105 BTC
         randomization_factor = random.uniform(0.95, 1.05)
         quantity = quantity * randomization_factor
-        quantity = round(quantity, 3)  # Aster requires 3 decimals max for BTC
+        quantity = self.risk_manager.quantize_quantity(quantity)
 
-        logger.info(
-            f"Position size: {quantity} {self.symbol[:3]} "
-            f"(${quantity * price:,.2f} notional at {settings.leverage}x leverage)"
+        logger.opt(lazy=True).info(
+            "Position size: {} {} (${:,.2f} notional at {}x leverage)",
+            lambda: quantity, lambda: self._base_asset,
+            lambda: quantity * price, lambda: self._leverage,
         )
         
         try:
             # ================================================================
-            # STEP 4: Place LONG market order
+            # STEP 4: Place LONG + SHORT in ONE batch request
             # ================================================================
             # BUY with position_side=LONG opens a long position
-            # Market order = instant fill at best available price
-            logger.info("📈 Placing LONG order...")
-            long_order = self.client.place_market_order(
-                symbol=self.symbol,
-                side="BUY",  # Buy BTC
-                quantity=quantity,
-                position_side="LONG"  # Open as LONG position (hedge mode)
-            )
-            logger.info(
-                f"✅ LONG filled: {long_order['executedQty']} @ "
-                f"${float(long_order['avgPrice']):,.2f}"
-            )
-
-            # ================================================================
-            # STEP 5: Delay before SHORT order (appear natural)
-            # ================================================================
-            # Random 2-5 second delay makes trading pattern less bot-like
-            delay_seconds = random.uniform(2, 5)
-            logger.debug(f"Waiting {delay_seconds:.1f} seconds before SHORT order...")
-            time.sleep(delay_seconds)
+            # SELL with position_side=SHORT opens a short position
+            # Sending both in one signed request means one round-trip and
+            # both legs fill at (almost) the same moment → minimal drift
+            logger.info("📈📉 Placing LONG + SHORT orders (batch)...")
+            long_order, short_order = await self.client.place_batch_market_orders([
+                {"symbol": self.symbol, "side": "BUY", "positionSide": "LONG", "quantity": quantity},
+                {"symbol": self.symbol, "side": "SELL", "positionSide": "SHORT", "quantity": quantity},
+            ])
 
             # ================================================================
-            # STEP 6: Place SHORT market order
+            # STEP 5: Make sure BOTH legs filled
             # ================================================================
-            # SELL with position_side=SHORT opens a short position
-            logger.info("📉 Placing SHORT order...")
-            short_order = self.client.place_market_order(
-                symbol=self.symbol,
-                side="SELL",  # Sell BTC
-                quantity=quantity,
-                position_side="SHORT"  # Open as SHORT position (hedge mode)
-            )
-            logger.info(
-                f"✅ SHORT filled: {short_order['executedQty']} @ "
-                f"${float(short_order['avgPrice']):,.2f}"
-            )
+            # The exchange accepts/rejects each order in a batch separately.
+            # A single filled leg is a naked directional position - undo it.
+            await self._ensure_both_legs_filled(long_order, short_order)
+
+            # Parse each fill ONCE - the DB records, in-memory state and
+            # logs below all reuse these numbers
+            orders = {"LONG": long_order, "SHORT": short_order}
+            fills = {side: _parse_fill(order) for side, order in orders.items()}
+
+            for side, (qty, fill_price, _, _) in fills.items():
+                logger.info("✅ {} filled: {} @ ${:,.2f}", side, qty, fill_price)
+                # Show our fill in the stream snapshot right away, so a risk
+                # check running before ACCOUNT_UPDATE arrives doesn't see 0
+                self.streamer.set_position(
+                    side, qty if side == "LONG" else -qty, fill_price
+                )
 
             # ================================================================
-            # STEP 7: Record trades and positions in database
+            # STEP 6: Record trades and positions in database
             # ================================================================
             # Store all trading activity for:
             # - Performance analysis
             # - Tax reporting
             # - Strategy optimization
             # - Debugging
-            opened_at = datetime.utcnow()
-
-            with get_db() as db:
-                # Loop through both orders and record them
-                for order, pos_side in [(long_order, "LONG"), (short_order, "SHORT")]:
-                    # Create Trade record (individual order execution)
-                    trade = Trade(
-                        symbol=self.symbol,
-                        side=order['side'],  # BUY or SELL
-                        position_side=pos_side,  # LONG or SHORT
-                        quantity=float(order['executedQty']),
-                        price=float(order['avgPrice']),
-                        notional=float(order['executedQty']) * float(order['avgPrice']),
-                        order_id=str(order['orderId']),
-                        commission=float(order.get('commission', 0))
-                    )
-                    db.add(trade)
-
-                    # Create Position record (tracks full lifecycle)
-                    position = Position(
-                        symbol=self.symbol,
-                        position_side=pos_side,
-                        entry_price=float(order['avgPrice']),
-                        quantity=float(order['executedQty']),
-                        leverage=settings.leverage,
-                        notional=float(order['executedQty']) * float(order['avgPrice']),
-                        is_active=True  # Position is now open
-                    )
-                    db.add(position)
+            opened_at = datetime.now(timezone.utc)
+            opened_monotonic = time.monotonic()
+            self._record_opened_positions(orders, fills)
 
             # ================================================================
-            # STEP 8: Update internal state tracking
+            # STEP 7: Update internal state tracking
             # ================================================================
             # Track these positions in memory for quick access
             # (Don't need to query database every time)
+            # Parsed size/price are kept for later risk math (no re-parsing)
             self.active_positions = {
-                "LONG": {
+                side: {
                     "opened_at": opened_at,
+                    "opened_monotonic": opened_monotonic,
                     "is_active": True,
-                    "entry_price": float(long_order['avgPrice'])
-                },
-                "SHORT": {
-                    "opened_at": opened_at,
-                    "is_active": True,
-                    "entry_price": float(short_order['avgPrice'])
+                    "entry_price": fill_price,
+                    "quantity": qty,
+                    "notional": notional,
                 }
+                for side, (qty, fill_price, notional, _) in fills.items()
             }
 
-            # Calculate and log key metrics
-            long_notional = float(long_order['executedQty']) * float(long_order['avgPrice'])
-            short_notional = float(short_order['executedQty']) * float(short_order['avgPrice'])
-            total_notional = long_notional + short_notional
-
-            logger.success(
-                f"✅ Delta-neutral pair opened successfully!\n"
-                f"   LONG:  {long_order['executedQty']} @ ${float(long_order['avgPrice']):,.2f} = ${long_notional:,.2f}\n"
-                f"   SHORT: {short_order['executedQty']} @ ${float(short_order['avgPrice']):,.2f} = ${short_notional:,.2f}\n"
-                f"   Total volume: ${total_notional:,.2f}\n"
-                f"   Hold for {settings.position_hold_time_min}+ minutes for 10x multiplier"
+            # Rotate as soon as the minimum hold time is reached
+            self._schedule_rotation()
+
+            # Log key metrics (summary only built if SUCCESS is enabled)
+            logger.opt(lazy=True).success(
+                "{}", lambda: self._format_open_summary(fills)
             )
 
         except Exception as e:
@@ -549,84 +728,319 @@ class DeltaNeutralStrategy:
             logger.exception("Full traceback:")
             raise  # Re-raise so run_cycle can handle it
     
-    def _rotate_positions(self):
+    def _format_open_summary(self, fills: Dict[str, Tuple[float, float, float, float]]) -> str:
+        """Multi-line summary of a freshly opened pair (for the log)"""
+        long_qty, long_price, long_notional, _ = fills["LONG"]
+        short_qty, short_price, short_notional, _ = fills["SHORT"]
+        total_notional = long_notional + short_notional
+        return (
+            f"✅ Delta-neutral pair opened successfully!\n"
+            f"   LONG:  {long_qty} @ ${long_price:,.2f} = ${long_notional:,.2f}\n"
+            f"   SHORT: {short_qty} @ ${short_price:,.2f} = ${short_notional:,.2f}\n"
+            f"   Total volume: ${total_notional:,.2f}\n"
+            f"   Hold for {self._hold_min}+ minutes for 10x multiplier"
+        )
+
+    def _record_opened_positions(
+        self, orders: Dict[str, Dict], fills: Dict[str, Tuple[float, float, float, float]]
+    ):
+        """
+        Record opening fills: a Trade and a Position row per side, and /metrics.
+
+        Used for a full pair and for a lone leg that is about to be undone,
+        so every closing trade has its opening trade on record.
+        """
+        # Build all records first, then write them in ONE transaction
+        # (one flush, one commit) instead of adding them one at a time
+        records = []
+        for pos_side, (qty, fill_price, notional, fee) in fills.items():
+            order = orders[pos_side]
+
+            # Trade record (individual order execution)
+            records.append(Trade(
+                symbol=self.symbol,
+                side=order['side'],  # BUY or SELL
+                position_side=pos_side,  # LONG or SHORT
+                quantity=qty,
+                price=fill_price,
+                notional=notional,
+                order_id=str(order['orderId']),
+                commission=fee
+            ))
+
+            # Position record (tracks full lifecycle)
+            records.append(Position(
+                symbol=self.symbol,
+                position_side=pos_side,
+                entry_price=fill_price,
+                quantity=qty,
+                leverage=self._leverage,
+                notional=notional,
+                is_active=True  # Position is now open
+            ))
+
+        with get_db() as db, db.no_autoflush:
+            db.add_all(records)
+
+        # Live counters for /metrics (cheap in-memory increments)
+        self._count_fills(fills)
+
+    def _count_fills(self, fills: Dict[str, Tuple[float, float, float, float]]):
+        """Add parsed fills (opens AND closes) to the /metrics trade counters"""
+        for side, (_, _, notional, fee) in fills.items():
+            metrics.TRADES.labels(self.symbol, side).inc()
+            metrics.TRADE_VOLUME.labels(self.symbol, side).inc(notional)
+            metrics.TRADE_FEES.labels(self.symbol).inc(fee)
+
+    async def _ensure_both_legs_filled(self, long_order: Dict, short_order: Dict):
+        """
+        Undo a half-opened pair if one leg of the batch was rejected.
+
+        Raises:
+            RuntimeError: If either leg failed (after closing the other one)
+        """
+        failed = [
+            side for side, order in (("LONG", long_order), ("SHORT", short_order))
+            if "orderId" not in order
+        ]
+        if not failed:
+            return
+
+        orders = {"LONG": long_order, "SHORT": short_order}
+        for side in ("LONG", "SHORT"):
+            if side not in failed:
+                # Record the opening fill first, so the close has its match
+                self._record_opened_positions(
+                    {side: orders[side]}, {side: _parse_fill(orders[side])}
+                )
+                logger.warning(f"Closing lone {side} leg to restore delta-neutrality")
+                result = await self.client.close_position(self.symbol, side)
+                self.streamer.set_position(side, 0.0, 0.0)
+                if result:
+                    self._record_closed_positions({side: result})
+
+        raise RuntimeError(f"Batch order leg(s) rejected: {', '.join(failed)}")
+
+    async def _rotate_positions(self):
         """Close current positions and open new ones"""
         logger.info("Rotating positions...")
+        self._cancel_rotation()
         
         try:
-            # Close existing positions
-            for position_side in ["LONG", "SHORT"]:
-                close_result = self.client.close_position(self.symbol, position_side)
-                if close_result:
-                    logger.info(f"Closed {position_side} position")
-                    
-                    # Record in database
-                    with get_db() as db:
-                        position = db.query(Position).filter(
-                            Position.symbol == self.symbol,
-                            Position.position_side == position_side,
-                            Position.is_active == True
-                        ).first()
-                        
-                        if position:
-                            position.is_active = False
-                            position.closed_at = datetime.utcnow()
-                            position.exit_price = float(close_result.get('avgPrice', 0))
-                            position.hold_time_minutes = int(
-                                (position.closed_at - position.opened_at).total_seconds() / 60
-                            )
-                            position.realized_pnl = float(close_result.get('realizedPnl', 0))
+            # Close both sides at the same time - closing one after the other
+            # leaves a naked leg (and price drift) for a full round-trip.
+            # return_exceptions=True: if one close fails, the other one
+            # still gets recorded before we re-raise.
+            sides = ["LONG", "SHORT"]
+            results = await asyncio.gather(
+                *(self.client.close_position(self.symbol, side) for side in sides),
+                return_exceptions=True,
+            )
+
+            close_results: Dict[str, Dict] = {}
+            errors = []
+            for position_side, close_result in zip(sides, results):
+                if isinstance(close_result, Exception):
+                    errors.append(close_result)
+                elif close_result:
+                    logger.info("Closed {} position", position_side)
+                    close_results[position_side] = close_result
+                    self.streamer.set_position(position_side, 0.0, 0.0)
+
+            # Record in database
+            if close_results:
+                self._record_closed_positions(close_results)
+            if errors:
+                raise errors[0]
             
-            # Small delay
-            time.sleep(random.uniform(5, 10))
+            # Small delay (yields to the event loop - the stream keeps running)
+            await asyncio.sleep(random.uniform(5, 10))
             
             # Open new positions
             self.active_positions = {}
-            self._open_delta_neutral_pair()
+            await self._open_delta_neutral_pair()
             
         except Exception as e:
             logger.error(f"Rotation failed: {e}")
             raise
     
-    def _check_and_close_risky_positions(self, positions: List[Dict]):
-        """Close positions that exceed risk limits"""
-        for pos in positions:
-            if float(pos['positionAmt']) == 0:
-                continue
-            
-            if self.risk_manager.should_close_position(pos):
-                logger.warning(f"Closing risky position: {pos['positionSide']}")
-                self.client.close_position(self.symbol, pos['positionSide'])
-                
-                if pos['positionSide'] in self.active_positions:
-                    self.active_positions[pos['positionSide']]['is_active'] = False
+    def _record_closed_positions(self, close_results: Dict[str, Dict]):
+        """
+        Record closing fills: Trade rows, Position rows, hold times and /metrics.
+
+        Used by every close path (rotation, risk close, lone-leg undo), so
+        volume, fees and realized PnL count the closing side of each trade.
+        The closing orders are stored as Trade rows like the opening ones
+        (one executemany INSERT via bulk_insert_trades).
+
+        One UPDATE covers both sides: CASE on position_side picks each
+        side's exit price, PnL and hold time. No rows are loaded into
+        Python, and the (is_active, symbol, position_side) index finds them.
+        """
+        closed_at = datetime.now(timezone.utc)
+        closed_monotonic = time.monotonic()
+        exit_price, realized_pnl, held_minutes = {}, {}, {}
+        for side, result in close_results.items():
+            exit_price[side] = float(result.get('avgPrice', 0))
+            realized_pnl[side] = float(result.get('realizedPnl', 0))
+            opened = self.active_positions.get(side, {}).get('opened_monotonic')
+            if opened is not None:
+                held_minutes[side] = (closed_monotonic - opened) / 60
+            metrics.REALIZED_PNL.labels(self.symbol).inc(realized_pnl[side])
+        fills = {side: _parse_fill(r) for side, r in close_results.items()}
+        self._count_fills(fills)
+
+        trades = [
+            {
+                "symbol": self.symbol,
+                "side": "SELL" if side == "LONG" else "BUY",  # closing order
+                "position_side": side,
+                "quantity": qty,
+                "price": fill_price,
+                "notional": notional,
+                "order_id": str(close_results[side]['orderId']),
+                "realized_pnl": realized_pnl[side],
+                "commission": fee,
+            }
+            for side, (qty, fill_price, notional, fee) in fills.items()
+        ]
+
+        with get_db() as db:
+            # No in-memory open time (e.g. the pair was opened before a
+            # restart) → fall back to the opened_at stored on the row
+            missing = [side for side in close_results if side not in held_minutes]
+            if missing:
+                for side, opened_at in db.query(Position.position_side, Position.opened_at).filter(
+                    Position.symbol == self.symbol,
+                    Position.position_side.in_(missing),
+                    Position.is_active == True
+                ):
+                    if opened_at is not None:
+                        # SQLite CURRENT_TIMESTAMP is naive UTC
+                        opened_at = opened_at.replace(tzinfo=opened_at.tzinfo or timezone.utc)
+                        held_minutes[side] = (closed_at - opened_at).total_seconds() / 60
+            for minutes in held_minutes.values():
+                metrics.HOLD_TIME.labels(self.symbol).observe(minutes)
+            hold_time = {
+                side: int(held_minutes[side]) if side in held_minutes else None
+                for side in close_results
+            }
+
+            bulk_insert_trades(db, trades)
+            db.query(Position).filter(
+                Position.symbol == self.symbol,
+                Position.position_side.in_(close_results),
+                Position.is_active == True
+            ).update({
+                Position.is_active: False,
+                Position.closed_at: closed_at,
+                Position.exit_price: case(exit_price, value=Position.position_side),
+                Position.realized_pnl: case(realized_pnl, value=Position.position_side),
+                Position.hold_time_minutes: case(hold_time, value=Position.position_side),
+            }, synchronize_session=False)
     
-    def _update_active_positions(self, positions: List[Dict]):
-        """Update internal state from exchange positions"""
-        for pos in positions:
-            if float(pos['positionAmt']) == 0:
-                if pos['positionSide'] in self.active_positions:
-                    self.active_positions[pos['positionSide']]['is_active'] = False
+    async def _reconcile_positions(self, positions: List[Dict], book: PositionBook,
+                                   close_mask: np.ndarray):
+        """
+        One pass over exchange positions: sync tracking and apply risk limits.
+
+        book/close_mask come from RiskManager.evaluate_all() on the same
+        positions (book row i == positions[i]).
+
+        For each position:
+        - Size 0 → closed on the exchange (rotation, liquidation, manual
+          close on the website) → mark inactive in our tracking
+        - Exceeds risk limits → close it AND the other leg, mark inactive
+        - Otherwise → nothing to do
+
+        Why close both legs?
+        A pair with only one leg left is a naked directional position - the
+        opposite of delta-neutral. Closing everything (and disarming the
+        rotation timer) leaves no active positions, so the next heartbeat
+        opens a fresh pair.
+
+        The legs close concurrently (like _rotate_positions). If one close
+        fails, the others are still recorded, the failed leg stays active
+        and is retried on the next reconcile (the next stream update), and
+        the error is re-raised for the caller to log.
+
+        Fields are parsed once into the risk manager's PositionBook
+        (reused NumPy buffers) and the risk rules run as one vectorized
+        check - only the flagged positions are touched in Python.
+        """
+        amt = book.amt
+
+        # A leg whose close failed last time is still a naked leg - retry it
+        retry, self._failed_closes = self._failed_closes, set()
+        if retry:
+            close_mask = close_mask | ((amt != 0) & np.fromiter(
+                (pos['positionSide'] in retry for pos in positions),
+                dtype=bool, count=len(positions),
+            ))
+
+        errors = []
+        if close_mask.any():
+            close_mask = amt != 0  # every open leg, flagged or not
+            sides = [positions[i]['positionSide'] for i in np.flatnonzero(close_mask)]
+            for side in sides:
+                logger.warning("Closing risky position: {}", side)
+            results = await asyncio.gather(
+                *(self.client.close_position(self.symbol, side) for side in sides),
+                return_exceptions=True,
+            )
+
+            close_results: Dict[str, Dict] = {}
+            for side, result in zip(sides, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to close {} position: {}", side, result)
+                    errors.append(result)
+                    self._failed_closes.add(side)
+                    continue
+                self.streamer.set_position(side, 0.0, 0.0)
+                if result:
+                    close_results[side] = result
+            self._cancel_rotation()
+            if close_results:
+                self._record_closed_positions(close_results)
+
+        for i in np.flatnonzero(close_mask | (amt == 0)):
+            side = positions[i]['positionSide']
+            if side in self.active_positions and side not in self._failed_closes:
+                self.active_positions[side]['is_active'] = False
+
+        if errors:
+            raise errors[0]
     
     def _log_position_status(self):
         """Log current position status"""
         for pos_side, data in self.active_positions.items():
             if data.get('is_active'):
-                opened_at = data.get('opened_at')
-                if opened_at:
-                    hold_time = (datetime.utcnow() - opened_at).total_seconds() / 60
-                    logger.info(f"Position {pos_side}: held for {hold_time:.1f} minutes")
+                opened = data.get('opened_monotonic')
+                if opened is not None:
+                    hold_time = (time.monotonic() - opened) / 60
+                    logger.info("Position {}: held for {:.1f} minutes", pos_side, hold_time)
     
-    def _log_daily_stats(self):
-        """Log daily trading statistics"""
+    def _log_daily_stats(self, now: datetime):
+        """
+        Refresh today's DailyStats row and log it (now = current UTC time).
+
+        SQLite does the summing (refresh_daily_stats: INSERT ... SELECT ...
+        GROUP BY), so no Trade rows are loaded - one DailyStats row comes back.
+        """
+        today = now.date()
         with get_db() as db:
-            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            trades_today = db.query(Trade).filter(Trade.timestamp >= today_start).all()
-            
-            total_volume = sum(t.notional for t in trades_today)
-            total_pnl = sum(t.realized_pnl for t in trades_today)
-            total_fees = sum(t.commission for t in trades_today)
-            
-            logger.info(f"📊 Today's Stats: Volume=${total_volume:.2f} | PnL=${total_pnl:.2f} | Fees=${total_fees:.2f}")
+            refresh_daily_stats(db, today)
+            stats = db.query(DailyStats).filter(
+                func.date(DailyStats.date) == today.isoformat()
+            ).one_or_none()
+
+            if stats is None:
+                # No trades yet today → no row written; log zeros
+                stats = DailyStats()
+
+            logger.info(
+                "📊 Today's Stats: Trades={} | Volume=${:.2f} | PnL=${:.2f} | Fees=${:.2f}",
+                stats.num_trades, stats.total_volume or 0.0,
+                stats.realized_pnl or 0.0, stats.fees_paid or 0.0,
+            )
 
@@ -0,0 +1,94 @@
+"""
+Position Book - Positions as NumPy Arrays (Struct of Arrays)
+
+The exchange returns positions as a list of dicts (an "array of structs"):
+
+    [{"positionAmt": "0.01", "entryPrice": "50000", ...},
+     {"positionAmt": "-0.01", "entryPrice": "50010", ...}]
+
+Every risk calculation on that layout means a Python loop with dict
+lookups and float() parsing per position. PositionBook stores the same
+data as one array per field (a "struct of arrays"):
+
+    amt        = [0.01, -0.01]
+    entry      = [50000.0, 50010.0]
+    unrealized = [-0.5, 0.4]
+
+so portfolio-wide math becomes single NumPy expressions, e.g.
+exposure = |amt| · entry.
+
+Buffers are preallocated and reused between loads (doubling when more
+positions arrive), so refreshing the book every tick allocates nothing.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class PositionBook:
+    """
+    Reusable struct-of-arrays mirror of an exchange position list.
+
+    Usage:
+        book = PositionBook()
+        book.load(client.get_position_risk(symbol="BTCUSDT"))
+        exposure = float(np.abs(book.amt) @ book.entry)
+    """
+
+    def __init__(self, capacity: int = 8):
+        """
+        Parameters:
+            capacity: Initial number of rows (grows automatically)
+        """
+        self._amt = np.zeros(capacity, dtype=np.float64)
+        self._entry = np.zeros(capacity, dtype=np.float64)
+        self._unrealized = np.zeros(capacity, dtype=np.float64)
+        self.n = 0  # Number of valid rows
+
+    def _reserve(self, n: int):
+        """Make room for n rows (capacity doubles, so growth is rare)"""
+        capacity = len(self._amt)
+        if n <= capacity:
+            return
+        capacity = max(n, capacity * 2)
+        self._amt = np.resize(self._amt, capacity)
+        self._entry = np.resize(self._entry, capacity)
+        self._unrealized = np.resize(self._unrealized, capacity)
+
+    def load(self, positions: List[Dict[str, Any]]) -> "PositionBook":
+        """Replace the book's contents with a positionRisk-style list"""
+        n = len(positions)
+        self._reserve(n)
+        amt, entry, unrealized = self._amt, self._entry, self._unrealized
+        for i, pos in enumerate(positions):
+            amt[i] = float(pos["positionAmt"])
+            entry[i] = float(pos["entryPrice"])
+            unrealized[i] = float(pos.get("unRealizedProfit", 0))
+        self.n = n
+        return self
+
+    @classmethod
+    def from_positions(cls, positions: List[Dict[str, Any]]) -> "PositionBook":
+        """Build a new book sized for the given positions"""
+        return cls(capacity=max(len(positions), 1)).load(positions)
+
+    # Views of the valid rows (no copies)
+
+    @property
+    def amt(self) -> np.ndarray:
+        """Position sizes (negative for shorts)"""
+        return self._amt[:self.n]
+
+    @property
+    def entry(self) -> np.ndarray:
+        """Entry prices"""
+        return self._entry[:self.n]
+
+    @property
+    def unrealized(self) -> np.ndarray:
+        """Unrealized PnL (USD)"""
+        return self._unrealized[:self.n]
+
+    def __len__(self) -> int:
+        return self.n
@@ -11,9 +11,17 @@ Risk management is the MOST important part of trading bots. Even the best
 strategy will fail without proper risk controls. This module is your safety net.
 """
 
+import asyncio
+import math
+
 from loguru import logger
 from aster_operator.config.settings import settings
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+from aster_operator.exchange.aster_client import AsyncAsterExchangeClient
+from aster_operator.strategy.position_book import PositionBook
 
 
 class RiskManager:
@@ -30,17 +38,42 @@ class RiskManager:
     Better to miss profits than to risk catastrophic losses.
     """
 
-    def __init__(self):
+    def __init__(self, client: Optional[AsyncAsterExchangeClient] = None):
         """
         Initialize risk manager with settings from config.
 
         These values are cached at initialization to ensure consistency
         throughout a trading cycle (even if settings file changes).
+
+        Parameters:
+            client: Exchange client - only needed for evaluate(), which
+                    fetches positions and price itself
         """
+        self.client = client
         self.capital = settings.capital_usdt
         self.max_position_size_pct = settings.max_position_size_pct
         self.leverage = settings.leverage
         self.stop_loss_pct = settings.stop_loss_pct
+        self.max_pnl_drift_pct = settings.max_pnl_drift_pct
+
+        # A position closes if |PnL %| exceeds the stop-loss OR the drift
+        # limit - i.e. if it exceeds the smaller of the two
+        self._combined_thr = min(self.stop_loss_pct, self.max_pnl_drift_pct)
+
+        # Limits derived from the values above - computed once here
+        # instead of on every sizing / exposure check
+        # Max notional per position (USD): capital × position% × leverage
+        self._max_notional = self.capital * self.max_position_size_pct * self.leverage / 100.0
+        # Max safe total exposure (USD): 50% of full leverage capacity
+        self._max_total_exposure = self.capital * self.leverage * 0.5
+
+        # Quantity step size and its inverse (steps per unit, e.g. 1000 for
+        # 0.001) - quantizing is then one multiply and one floor
+        self._tick_size = settings.symbol_tick_size
+        self._inv_tick = 1.0 / self._tick_size
+
+        # Reused NumPy buffers for exposure math (see PositionBook)
+        self.book = PositionBook()
 
     def calculate_position_size(self, price: float) -> float:
         """
@@ -73,29 +106,45 @@ class RiskManager:
             Position size in base currency (e.g., 0.0045 BTC)
 
         Note:
-            Rounded to 3 decimal places for BTC. Adjust for other assets
-            (e.g., ETH might use 2 decimals, altcoins might use 0-1).
+            Rounded down to the symbol's step size (SYMBOL_TICK_SIZE,
+            0.001 for BTC) so the exchange always accepts the quantity.
         """
-        # Calculate maximum notional value (USD) for this position
-        # This is how much "buying power" we have with leverage
-        max_notional = self.capital * (self.max_position_size_pct / 100) * self.leverage
-
-        # Convert notional to quantity in base currency
-        # E.g., $225 ÷ $50,000/BTC = 0.0045 BTC
-        quantity = max_notional / price
-
-        # Round to reasonable precision
-        # BTC: Aster requires 3 decimals for BTC
-        # Adjust this for other assets (ETH might use 2-3 decimals, altcoins vary)
-        quantity = round(quantity, 3)
-
-        logger.debug(
-            f"Position size calculated: {quantity} units @ ${price:,.2f} "
-            f"= ${quantity * price:,.2f} notional (with {self.leverage}x leverage)"
+        # Convert max notional (precomputed in __init__) to quantity in
+        # base currency. E.g., $225 ÷ $50,000/BTC = 0.0045 BTC
+        quantity = self._max_notional / price
+
+        # Round down to a whole number of steps (exchange lot size)
+        quantity = self.quantize_quantity(quantity)
+
+        # Lazy: the message is only formatted if DEBUG logging is enabled
+        logger.opt(lazy=True).debug(
+            "Position size calculated: {} units @ ${:,.2f} = ${:,.2f} notional "
+            "(with {}x leverage)",
+            lambda: quantity, lambda: price,
+            lambda: quantity * price, lambda: self.leverage,
         )
 
         return quantity
 
+    def quantize_quantity(self, quantity: float) -> float:
+        """
+        Round a quantity DOWN to a multiple of the symbol's step size.
+
+        Rounding down (never up) keeps the position within its size limit,
+        and a whole number of steps is always a valid order quantity.
+
+        Example (step 0.001): 0.00457 → 4 steps → 0.004
+
+        Notes:
+            - The tiny epsilon absorbs float error such as
+              0.29 × 1000 = 289.99999999999994 (should be 290 steps)
+            - Dividing the step count by _inv_tick (instead of multiplying by
+              the step size) yields the closest float to the exact value,
+              so 35 steps prints as 0.035, not 0.035000000000000003
+        """
+        steps = math.floor(quantity * self._inv_tick + 1e-9)
+        return steps / self._inv_tick
+
     def should_close_position(self, position: Dict[str, Any]) -> bool:
         """
         Check if a position should be closed due to risk limits.
@@ -149,43 +198,77 @@ class RiskManager:
             )
             return False
 
-        # Calculate PnL as percentage of position value
-        # This normalizes PnL across different position sizes
-        # Formula: (unrealized_pnl / position_value) × 100
-        position_value = abs(entry_price * position_amt)
-        pnl_pct = (unrealized_pnl / position_value) * 100
+        # One implementation of the limits: run the vectorized check on a
+        # single row (see should_close_mask for the rules themselves)
+        close_mask = self.should_close_mask(
+            np.array([entry_price]), np.array([position_amt]), np.array([unrealized_pnl])
+        )
+        return bool(close_mask[0])
+
+    def should_close_mask(
+        self,
+        entry_price: np.ndarray,
+        position_amt: np.ndarray,
+        unrealized_pnl: np.ndarray,
+        position_value: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Vectorized should_close_position() for many positions at once.
 
-        # Risk Check #1: Stop-loss
-        # If loss exceeds stop_loss_pct (default 1%), close immediately
-        # Using abs() because we care about magnitude of loss, not direction
-        if abs(pnl_pct) > self.stop_loss_pct:
-            logger.warning(
-                f"⚠️ STOP-LOSS TRIGGERED: PnL {pnl_pct:.2f}% exceeds limit of {self.stop_loss_pct}%"
-            )
-            logger.warning(
-                f"Position details: {position_amt} units @ ${entry_price:,.2f}, "
-                f"Unrealized PnL: ${unrealized_pnl:.2f}"
-            )
-            return True
+        Same rules (stop-loss and drift on PnL % of position value), but the
+        math runs as a few NumPy operations over whole arrays instead of one
+        Python call per position. Scales to many symbols at no extra cost.
 
-        # Risk Check #2: Delta-neutral drift
-        # For delta-neutral strategy, PnL should be near 0%
-        # If it drifts too far, one leg is outperforming (or underperforming) the other
-        # This means we're taking directional risk - not what we want!
-        if abs(pnl_pct) > settings.max_pnl_drift_pct:
-            logger.warning(
-                f"⚠️ DELTA DRIFT DETECTED: PnL {pnl_pct:.2f}% exceeds drift limit of {settings.max_pnl_drift_pct}%"
-            )
+        Parameters:
+            entry_price: Entry price per position
+            position_amt: Position size per position (negative for shorts)
+            unrealized_pnl: Unrealized PnL (USD) per position
+            position_value: |entry × amt| per position, if the caller has
+                            already computed it (see evaluate_all)
+
+        Returns:
+            Boolean array - True where the position should be closed.
+            Closed/invalid rows (size or entry price 0) are never flagged.
+
+        Example:
+            amt   = np.array([0.01, -0.01])
+            entry = np.array([50_000.0, 50_000.0])
+            upnl  = np.array([-600.0, 5.0])
+            should_close_mask(entry, amt, upnl) → [True, False]
+        """
+        if position_value is None:
+            position_value = np.abs(entry_price * position_amt)
+        valid = position_value > 0
+
+        # PnL % of position value (0 for invalid rows - no divide by zero)
+        pnl_pct = np.divide(
+            unrealized_pnl, position_value,
+            out=np.zeros_like(position_value), where=valid
+        ) * 100
+
+        # Two limits on |PnL %| (magnitude - direction doesn't matter):
+        # - Stop-loss: loss beyond stop_loss_pct (default 1%) → close
+        # - Delta drift: a delta-neutral pair should sit near 0%; beyond
+        #   max_pnl_drift_pct (default 0.8%) one leg is out-running the
+        #   other and we're taking directional risk → close and reset
+        # "Above stop-loss OR above drift" == "above the smaller of the two"
+        mask = valid & (np.abs(pnl_pct) > self._combined_thr)
+
+        # Explain each trigger (rare - the common path never logs)
+        for i in np.flatnonzero(mask):
+            if abs(pnl_pct[i]) > self.stop_loss_pct:
+                reason, limit = "STOP-LOSS TRIGGERED", self.stop_loss_pct
+            else:
+                reason, limit = "DELTA DRIFT DETECTED", self.max_pnl_drift_pct
             logger.warning(
-                f"This means your LONG and SHORT positions are imbalanced. "
-                f"Closing to reset delta-neutrality."
+                f"⚠️ {reason}: PnL {pnl_pct[i]:.2f}% exceeds limit of {limit}% "
+                f"({position_amt[i]} units @ ${entry_price[i]:,.2f}, "
+                f"Unrealized PnL: ${unrealized_pnl[i]:.2f})"
             )
-            return True
 
-        # All checks passed - position is within acceptable risk
-        return False
+        return mask
 
-    def get_current_exposure(self, positions: list) -> float:
+    def get_current_exposure(self, positions: Union[PositionBook, List[Dict]]) -> float:
         """
         Calculate total notional exposure across all positions.
 
@@ -206,7 +289,8 @@ class RiskManager:
         Current exposure: $1,500 (20% of max) ✓ Safe
 
         Parameters:
-            positions: List of position dicts from exchange API
+            positions: PositionBook, or list of position dicts from exchange
+                       API (loaded into self.book's reusable buffers)
 
         Returns:
             Total notional exposure in USD
@@ -214,18 +298,23 @@ class RiskManager:
         Note:
             Uses abs() because we care about exposure magnitude, not direction.
             Short -0.01 BTC is same exposure as Long +0.01 BTC.
+            Closed positions (size 0) contribute 0 automatically.
         """
-        total = sum(
-            abs(float(pos["positionAmt"])) * float(pos["entryPrice"])
-            for pos in positions
-            if float(pos["positionAmt"]) != 0  # Skip closed positions
-        )
+        book = positions if isinstance(positions, PositionBook) else self.book.load(positions)
+
+        # Σ |amt| × entry as one dot product (no Python loop)
+        total = float(np.abs(book.amt) @ book.entry)
 
-        logger.debug(f"Current total exposure: ${total:,.2f} across {len(positions)} positions")
+        logger.opt(lazy=True).debug(
+            "Current total exposure: ${:,.2f} across {} positions",
+            lambda: total, lambda: len(book),
+        )
 
         return total
 
-    def can_open_new_position(self, price: float, positions: list) -> bool:
+    def can_open_new_position(
+        self, price: float, positions: Union[PositionBook, List[Dict]]
+    ) -> bool:
         """
         Check if we can safely open a new position.
 
@@ -258,8 +347,9 @@ class RiskManager:
         $8,000 > $7,500 → REJECT ✗
 
         Parameters:
-            price: Current asset price
-            positions: List of existing positions
+            price: Current asset price (unused by the check itself - the new
+                   position is counted at its maximum notional)
+            positions: Existing positions (PositionBook or exchange dicts)
 
         Returns:
             True if new position is safe to open, False otherwise
@@ -270,18 +360,11 @@ class RiskManager:
             - More conservative: 0.3 (use 30% of max leverage)
         """
         current_exposure = self.get_current_exposure(positions)
-
-        # Calculate notional value of proposed new position
-        new_position_size = self.calculate_position_size(price)
-        new_notional = new_position_size * price
-
-        # Maximum safe exposure = 50% of full leverage capacity
-        # This conservative limit protects against liquidation
-        max_total_exposure = self.capital * self.leverage * 0.5
-
+        new_notional = self._max_notional
+        max_total_exposure = self._max_total_exposure
         total_exposure_if_opened = current_exposure + new_notional
 
-        if total_exposure_if_opened > max_total_exposure:
+        if not self._fits_exposure(current_exposure):
             logger.warning(
                 f"❌ Cannot open new position: would exceed safe exposure limits"
             )
@@ -289,7 +372,7 @@ class RiskManager:
                 f"Current exposure: ${current_exposure:,.2f}"
             )
             logger.warning(
-                f"New position notional: ${new_notional:,.2f}"
+                f"New position notional (max): ${new_notional:,.2f}"
             )
             logger.warning(
                 f"Total would be: ${total_exposure_if_opened:,.2f} "
@@ -297,10 +380,88 @@ class RiskManager:
             )
             return False
 
-        logger.debug(
-            f"✅ Safe to open position: ${total_exposure_if_opened:,.2f} / ${max_total_exposure:,.2f} "
-            f"({(total_exposure_if_opened/max_total_exposure)*100:.1f}% of max)"
+        logger.opt(lazy=True).debug(
+            "✅ Safe to open position: ${:,.2f} / ${:,.2f} ({:.1f}% of max)",
+            lambda: total_exposure_if_opened, lambda: max_total_exposure,
+            lambda: total_exposure_if_opened / max_total_exposure * 100,
         )
 
         return True
 
+    def _fits_exposure(self, current_exposure: float) -> bool:
+        """
+        True if one more position fits under the max safe exposure.
+
+        The new position is counted at _max_notional: any order sized by
+        calculate_position_size() is at most that (quantizing only rounds
+        down), so no size → price round trip is needed.
+        Max safe exposure = 50% of full leverage capacity - a conservative
+        limit that protects against liquidation.
+        """
+        return current_exposure + self._max_notional <= self._max_total_exposure
+
+    def evaluate_all(self, book: PositionBook) -> Tuple[np.ndarray, bool]:
+        """
+        Every risk check for a whole PositionBook in one vectorized pass.
+
+        This is what the strategy runs on each position update; the caller
+        closes positions off close_mask and only opens a pair if can_open.
+
+        Both checks start from the same per-position notional |entry × amt|,
+        so it is computed once and shared:
+        - close_mask: stop-loss / drift (should_close_mask)
+        - can_open: exposure + max new position ≤ max safe exposure,
+          as in can_open_new_position(). Positions flagged for closing
+          don't count - they're about to be gone.
+
+        The exposure limit applies to the portfolio as a whole, so it is
+        one boolean rather than a per-position mask. It isn't logged here
+        (this runs on every stream tick) - the caller logs a refusal.
+
+        Parameters:
+            book: Current positions (see PositionBook)
+
+        Returns:
+            (close_mask, can_open)
+        """
+        position_value = np.abs(book.entry * book.amt)
+        close_mask = self.should_close_mask(
+            book.entry, book.amt, book.unrealized, position_value=position_value
+        )
+        can_open = self._fits_exposure(float(position_value[~close_mask].sum()))
+        return close_mask, can_open
+
+    async def evaluate(
+        self, symbol: str
+    ) -> Tuple[List[Dict[str, Any]], float, np.ndarray, bool]:
+        """
+        Fetch positions and price, then run every risk check in one go.
+
+        The two REST calls are independent, so they run concurrently:
+        total wait ≈ the slower of the two instead of their sum.
+
+        Parameters:
+            symbol: Trading pair, e.g. "BTCUSDT"
+
+        Returns:
+            (positions, price, close_mask, can_open):
+            - positions: raw positionRisk list from the exchange
+            - price: current mark price (to size a new position with)
+            - close_mask: True for each position that should be closed
+            - can_open: whether another position fits within exposure limits
+
+        Example:
+            positions, price, close_mask, can_open = await rm.evaluate("BTCUSDT")
+            for i in np.flatnonzero(close_mask):
+                ...close positions[i]...
+        """
+        if self.client is None:
+            raise RuntimeError("RiskManager.evaluate() needs an exchange client")
+
+        positions, price = await asyncio.gather(
+            self.client.get_position_risk(symbol=symbol),
+            self.client.get_mark_price_cached(symbol),
+        )
+
+        close_mask, can_open = self.evaluate_all(self.book.load(positions))
+        return positions, price, close_mask, can_open
@@ -0,0 +1,53 @@
+"""
+Prometheus Metrics - Live Trading Counters
+
+Exposes the bot's activity at http://<host>:<METRICS_PORT>/metrics so it can
+be scraped by Prometheus and graphed in Grafana.
+
+Why metrics (in addition to the database)?
+- The database answers "what happened?" - great for analysis, taxes, debugging
+- Metrics answer "what's happening right now?" - dashboards and alerts
+  ("no volume in the last 2 hours", "realized PnL dropping")
+- Updating a counter is a single in-memory addition at trade time;
+  nothing is re-read from the database to produce them
+
+Metric types used:
+- Counter: only goes up (volume, fees, number of trades)
+- Gauge: can go up and down (realized PnL since start)
+- Histogram: distribution of values (how long positions were held)
+
+All values are since process start - Prometheus handles restarts and
+computes per-day totals with increase(metric[1d]).
+"""
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from loguru import logger
+
+
+TRADE_VOLUME = Counter(
+    "aster_trade_volume_usdt", "Notional volume of filled orders (USDT)", ["symbol", "position_side"]
+)
+TRADE_FEES = Counter(
+    "aster_trade_fees_usdt", "Commission paid on filled orders (USDT)", ["symbol"]
+)
+TRADES = Counter(
+    "aster_trades", "Number of filled orders", ["symbol", "position_side"]
+)
+REALIZED_PNL = Gauge(
+    "aster_realized_pnl_usdt", "Realized PnL of closed positions since start (USDT)", ["symbol"]
+)
+HOLD_TIME = Histogram(
+    "aster_position_hold_minutes",
+    "How long positions were held before closing (minutes)",
+    ["symbol"],
+    # Finer resolution around the 90-minute multiplier threshold
+    buckets=(10, 30, 60, 85, 90, 95, 100, 120, 180, 240, float("inf")),
+)
+
+
+def start_metrics_server(port: int):
+    """Serve /metrics on the given port (0 = metrics disabled)"""
+    if not port:
+        return
+    start_http_server(port)
+    logger.info(f"📈 Prometheus metrics on http://0.0.0.0:{port}/metrics")
@@ -0,0 +1,26 @@
+"""
+Shared pytest setup for the unit tests.
+
+Settings are read from the environment the first time they're used, so
+dummy credentials and a throwaway database path are set here - before any
+test module imports aster_operator. Nothing in the unit tests talks to
+the exchange (test_mvp.py is the live-API check).
+"""
+
+import os
+import tempfile
+
+os.environ.update(
+    ASTER_API_KEY="test-key",
+    ASTER_API_SECRET="test-secret",
+    WALLET_ADDRESS="0xtest",
+    CAPITAL_USDT="1000",
+    LEVERAGE="15",
+    MAX_POSITION_SIZE_PCT="1.5",
+    STOP_LOSS_PCT="1.0",
+    MAX_PNL_DRIFT_PCT="0.8",
+    SYMBOL_TICK_SIZE="0.001",
+    TRADING_PAIRS='["BTCUSDT"]',
+    METRICS_PORT="0",
+    DB_PATH=os.path.join(tempfile.mkdtemp(prefix="aster-operator-test-"), "test.db"),
+)
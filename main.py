@@ -2,11 +2,13 @@
 """
 Aster Operator - Delta-Neutral Trading Bot for Aster DEX
 """
-import time
+import argparse
+import asyncio
 from loguru import logger
 from aster_operator.database.db import init_db
 from aster_operator.strategy.delta_neutral import DeltaNeutralStrategy
 from aster_operator.config.settings import settings
+from aster_operator.utils.metrics import start_metrics_server
 
 def setup_logging():
     """Configure logging"""
@@ -17,38 +19,60 @@ def setup_logging():
         level="INFO"
     )
 
-def main():
-    """Main bot loop"""
-    setup_logging()
-    logger.info("=" * 60)
-    logger.info("🚀 Aster Operator Starting...")
-    logger.info(f"Capital: ${settings.capital_usdt}")
-    logger.info(f"Leverage: {settings.leverage}x")
-    logger.info(f"Target Daily Volume: ${settings.daily_volume_target}")
-    logger.info("=" * 60)
-    
+def parse_args():
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Aster Operator trading bot")
+    parser.add_argument(
+        "--force-reconfigure",
+        action="store_true",
+        help="Set leverage/position mode on the exchange even if cached",
+    )
+    return parser.parse_args()
+
+async def run_bot(force_reconfigure: bool = False):
+    """Main bot loop (runs on one asyncio event loop)"""
     # Initialize database
     init_db()
+
+    # Expose live metrics for Prometheus (METRICS_PORT=0 disables)
+    start_metrics_server(settings.metrics_port)
     
-    # Initialize strategy
+    # Initialize strategy and start the exchange connection + position stream
     strategy = DeltaNeutralStrategy()
+    await strategy.start(force_reconfigure=force_reconfigure)
     
-    # Main loop - run every 10 minutes
+    # Heartbeat loop - every 10 minutes
+    # (rotation, risk checks and daily stats are event-driven, see strategy)
     cycle_interval_seconds = 600  # 10 minutes
     
     try:
         while True:
             try:
-                strategy.run_cycle()
+                await strategy.run_cycle()
             except Exception as e:
                 logger.error(f"Cycle error: {e}")
                 logger.info("Continuing in 60 seconds...")
-                time.sleep(60)
+                await asyncio.sleep(60)
                 continue
             
             logger.info(f"Sleeping for {cycle_interval_seconds} seconds...")
-            time.sleep(cycle_interval_seconds)
-            
+            await asyncio.sleep(cycle_interval_seconds)
+    finally:
+        await strategy.stop()
+
+def main():
+    """Entry point"""
+    args = parse_args()
+    setup_logging()
+    logger.info("=" * 60)
+    logger.info("🚀 Aster Operator Starting...")
+    logger.info(f"Capital: ${settings.capital_usdt}")
+    logger.info(f"Leverage: {settings.leverage}x")
+    logger.info(f"Target Daily Volume: ${settings.daily_volume_target}")
+    logger.info("=" * 60)
+    
+    try:
+        asyncio.run(run_bot(force_reconfigure=args.force_reconfigure))
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
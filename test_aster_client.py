@@ -0,0 +1,109 @@
+"""Unit tests for AsterExchangeClient error handling (SDK calls are stubbed)"""
+import asyncio
+import time
+
+import pytest
+
+from aster_operator.exchange.aster.error import ClientError, ServerError
+from aster_operator.exchange.aster_client import AsterExchangeClient, AsyncAsterExchangeClient
+
+
+def _raise(error_code, message):
+    def call(**kwargs):
+        raise ClientError(400, error_code, message, {})
+    return call
+
+
+@pytest.fixture
+def client():
+    c = AsterExchangeClient()
+    yield c
+    c.close()
+
+
+def test_position_mode_already_set_is_success(client):
+    client.client.change_position_mode = _raise(-4059, "No need to change position side.")
+    assert client.set_position_mode(True) is None
+
+
+def test_position_mode_other_errors_propagate(client):
+    client.client.change_position_mode = _raise(-2015, "Invalid API-key")
+    with pytest.raises(ClientError):
+        client.set_position_mode(True)
+
+
+def test_leverage_unchanged_is_success(client):
+    client.client.change_leverage = _raise(-4046, "No need to change")
+    assert client.set_leverage("BTCUSDT", 15) is None
+
+
+def test_transport_does_not_retry(client):
+    """_retry() is the only retry layer - urllib3 must not multiply it"""
+    adapter = client.client.session.get_adapter("https://example.com")
+    assert adapter.max_retries.total == 0
+
+
+def test_cached_mark_price_survives_one_missed_tick(client, monkeypatch):
+    """A 1s stream that skips one tick must not fall back to REST"""
+    client._price_cache["BTCUSDT"] = (time.monotonic() - 1.5, 50_000.0)
+    monkeypatch.setattr(client, "get_mark_price", lambda symbol: pytest.fail("REST call"))
+    assert client.get_mark_price_cached("BTCUSDT") == 50_000.0
+
+
+def test_retry_gives_up_after_retry_attempts(client, monkeypatch):
+    monkeypatch.setattr("aster_operator.exchange.aster_client.time.sleep", lambda _: None)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise ServerError(503, "unavailable")
+
+    with pytest.raises(ServerError):
+        client._retry(flaky)
+    assert len(calls) == client.RETRY_ATTEMPTS
+
+
+@pytest.fixture
+def async_client(client):
+    """Async client whose acquired weights and orders are recorded"""
+    aclient = AsyncAsterExchangeClient(client)
+    aclient.weights, aclient.orders = [], []
+
+    async def acquire(weight, priority):
+        aclient.weights.append(weight)
+
+    def place_market_order(**order):
+        if order["quantity"] != 0.02 and aclient.reject_tracked:
+            raise ClientError(400, -2022, "ReduceOnly Order is rejected.", {})
+        aclient.orders.append(order)
+        return {"orderId": len(aclient.orders)}
+
+    aclient.limiter.acquire = acquire
+    aclient.reject_tracked = False
+    client.place_market_order = place_market_order
+    client.get_position_risk = lambda symbol=None: [
+        {"positionSide": "LONG", "positionAmt": "0.02"},
+    ]
+    return aclient
+
+
+def test_close_tracked_position_costs_one_order(async_client):
+    async_client.sync._open[("BTCUSDT", "LONG")] = 0.02
+    asyncio.run(async_client.close_position("BTCUSDT", "LONG"))
+    assert async_client.weights == [1]
+    assert async_client.orders[0]["reduce_only"]
+
+
+def test_close_untracked_position_pays_for_the_lookup(async_client):
+    asyncio.run(async_client.close_position("BTCUSDT", "LONG"))
+    assert async_client.weights == [6]  # positionRisk 5 + order 1
+    assert async_client.orders[0]["quantity"] == 0.02
+
+
+def test_rejected_tracked_size_falls_back_to_exchange(async_client):
+    async_client.sync._open[("BTCUSDT", "LONG")] = 0.05
+    async_client.reject_tracked = True
+    result = asyncio.run(async_client.close_position("BTCUSDT", "LONG"))
+    assert async_client.weights == [1, 6]
+    assert result == {"orderId": 1}
+    assert async_client.sync.tracked_quantity("BTCUSDT", "LONG") is None
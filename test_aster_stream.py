@@ -0,0 +1,106 @@
+"""Unit tests for PositionStreamer (WebSocket and REST calls are stubbed)"""
+import asyncio
+
+import orjson
+import pytest
+
+from aster_operator.exchange import aster_stream
+from aster_operator.exchange.aster_client import AsterExchangeClient
+from aster_operator.exchange.aster_stream import PositionStreamer
+
+
+class FakeSocket:
+    """
+    Stands in for websockets.connect(): yields the given messages, then
+    closes - or, with hold, stays open until hold is set.
+    """
+
+    def __init__(self, messages, hold=None):
+        self.messages = [orjson.dumps(m) for m in messages]
+        self.drained = asyncio.Event()  # set once every message was read
+        self.hold = hold
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            self.drained.set()
+            if self.hold is not None:
+                await self.hold.wait()
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+
+def mark_price(price):
+    return {"data": {"e": "markPriceUpdate", "s": "BTCUSDT", "p": str(price)}}
+
+
+def account_update(side, amt, entry):
+    return {"data": {"e": "ACCOUNT_UPDATE", "a": {"P": [
+        {"s": "BTCUSDT", "ps": side, "pa": str(amt), "ep": str(entry), "up": "0"},
+    ]}}}
+
+
+def rest_position(side, amt, entry=50_000.0):
+    return {"symbol": "BTCUSDT", "positionSide": side,
+            "positionAmt": str(amt), "entryPrice": str(entry), "unRealizedProfit": "0"}
+
+
+@pytest.fixture
+def client():
+    c = AsterExchangeClient()
+    c.start_user_stream = lambda: "listen-key"
+    c.rest_positions = []
+    c.get_position_risk = lambda symbol=None: c.rest_positions
+    yield c
+    c.close()
+
+
+def connect_with(monkeypatch, *connections):
+    """Each websockets.connect() call serves the next list of messages"""
+    sockets = iter(connections)
+    monkeypatch.setattr(aster_stream.websockets, "connect",
+                        lambda url, **kwargs: FakeSocket(next(sockets)))
+
+
+def test_connect_seeds_from_rest_before_going_live(client, monkeypatch):
+    client.rest_positions = [rest_position("LONG", 0.01), rest_position("SHORT", -0.01)]
+    connect_with(monkeypatch, [mark_price(50_100), account_update("SHORT", 0, 0)])
+    streamer = PositionStreamer(client, "BTCUSDT")
+    seen = []
+    streamer.on_update = lambda: seen.append(streamer.positions())
+
+    asyncio.run(streamer._connect_once())
+
+    # Live from the first tick - no strategy-side seed needed
+    first = {p["positionSide"]: p for p in seen[0]}
+    assert first["LONG"]["unRealizedProfit"] == pytest.approx(1.0)  # (50100 - 50000) × 0.01
+    # Stream events apply on top of the REST seed
+    assert {p["positionSide"]: float(p["positionAmt"]) for p in seen[1]} == {"LONG": 0.01, "SHORT": 0.0}
+    # Disconnected → not live until the next connect reseeds
+    assert streamer.positions() is None
+
+
+def test_reconnect_reseeds(client, monkeypatch):
+    connect_with(monkeypatch, [mark_price(50_000)], [mark_price(50_000)])
+    streamer = PositionStreamer(client, "BTCUSDT")
+    seen = []
+    streamer.on_update = lambda: seen.append(streamer.positions())
+
+    async def scenario():
+        client.rest_positions = [rest_position("LONG", 0.01)]
+        await streamer._connect_once()
+        # Closed on the website while we were disconnected
+        client.rest_positions = [rest_position("LONG", 0.0, entry=0.0)]
+        await streamer._connect_once()
+
+    asyncio.run(scenario())
+
+    assert [float(p[0]["positionAmt"]) for p in seen] == [0.01, 0.0]
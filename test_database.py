@@ -0,0 +1,24 @@
+"""Unit tests for the database models against a scratch SQLite file"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from aster_operator.database.models import Base, Trade
+
+
+def test_timestamp_filled_without_server_default(tmp_path):
+    """Older DB files have no DEFAULT on trades.timestamp - still not NULL"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Recreate the column as an older version did: no database default
+        for index in ("ix_trade_sym_ts", "ix_trades_timestamp"):
+            conn.exec_driver_sql(f"DROP INDEX {index}")
+        conn.exec_driver_sql("ALTER TABLE trades DROP COLUMN timestamp")
+        conn.exec_driver_sql("ALTER TABLE trades ADD COLUMN timestamp DATETIME")
+
+    with Session(engine) as db:
+        db.add(Trade(symbol="BTCUSDT", side="BUY", position_side="LONG",
+                     quantity=0.01, price=50_000.0, notional=500.0))
+        db.commit()
+        assert db.query(Trade).one().timestamp is not None
+    engine.dispose()
@@ -0,0 +1,61 @@
+"""Unit tests for the request-weight RateLimiter"""
+import asyncio
+
+from aster_operator.exchange.rate_limiter import Priority, RateLimiter
+
+
+def _drained(weight_per_minute=6000):
+    """Limiter with an empty bucket (6000/min → one weight every 10 ms)"""
+    limiter = RateLimiter(weight_per_minute, safety_margin=1.0)
+    limiter._tokens = 0.0
+    return limiter
+
+
+def test_fast_path_takes_tokens():
+    limiter = RateLimiter(100, safety_margin=1.0)
+    asyncio.run(limiter.acquire(40, Priority.LOW))
+    assert 59 < limiter._tokens < 61
+    assert not limiter._queue
+
+
+def test_waiters_served_by_priority_then_arrival():
+    limiter = _drained()
+    served = []
+
+    async def request(name, priority):
+        await limiter.acquire(1, priority)
+        served.append(name)
+
+    async def scenario():
+        # Queued in this order while the bucket is empty
+        await asyncio.gather(
+            request("price", Priority.LOW),
+            request("positions", Priority.NORMAL),
+            request("close-1", Priority.HIGH),
+            request("close-2", Priority.HIGH),
+        )
+
+    asyncio.run(scenario())
+    assert served == ["close-1", "close-2", "positions", "price"]
+
+
+def test_cancelled_waiter_is_skipped():
+    limiter = _drained()
+
+    async def scenario():
+        big = asyncio.create_task(limiter.acquire(50, Priority.HIGH))
+        await asyncio.sleep(0)  # queued at the head
+        big.cancel()
+        # Served well before the 0.5 s the cancelled request would need
+        await asyncio.wait_for(limiter.acquire(1, Priority.LOW), timeout=0.3)
+
+    asyncio.run(scenario())
+    assert not limiter._queue
+
+
+def test_observed_weight_only_lowers_the_bucket():
+    limiter = RateLimiter(1000, safety_margin=1.0)
+    limiter.observe_used_weight(700)
+    assert limiter._tokens < 301
+    limiter.observe_used_weight(100)  # exchange says less than we think
+    assert limiter._tokens < 301
@@ -0,0 +1,84 @@
+"""Unit tests for RiskManager sizing, risk limits and PositionBook (settings from conftest.py)"""
+import pytest
+
+from aster_operator.strategy.position_book import PositionBook
+from aster_operator.strategy.risk_manager import RiskManager
+
+
+def _position(amt, unrealized, entry=50_000.0):
+    return {"positionAmt": str(amt), "entryPrice": str(entry), "unRealizedProfit": str(unrealized)}
+
+
+@pytest.fixture
+def rm():
+    return RiskManager()
+
+
+@pytest.mark.parametrize("quantity, expected", [
+    (0.00457, 0.004),     # rounds DOWN, never up
+    (0.29, 0.29),         # 0.29 × 1000 = 289.999... must stay 290 steps
+    (0.035, 0.035),
+    (0.0359999, 0.035),
+    (0.0009, 0.0),
+])
+def test_quantize_quantity(rm, quantity, expected):
+    assert rm.quantize_quantity(quantity) == expected
+    assert repr(rm.quantize_quantity(quantity)) == repr(expected)  # no float noise
+
+
+def test_position_size_respects_max_notional(rm):
+    # $1000 × 1.5% × 15x = $225 → 0.0045 BTC → 0.004 after rounding down
+    assert rm.calculate_position_size(50_000.0) == 0.004
+    assert rm.calculate_position_size(50_000.0) * 50_000.0 <= 225.0
+
+
+@pytest.mark.parametrize("unrealized, expected", [
+    (-4.0, False),    # -0.8% of $500 → exactly at the drift limit
+    (-4.2, True),     # -0.84% → drift
+    (4.2, True),      # direction doesn't matter
+    (-6.0, True),     # -1.2% → stop-loss
+    (0.5, False),
+])
+def test_should_close_position(rm, unrealized, expected):
+    assert rm.should_close_position(_position(0.01, unrealized)) is expected
+
+
+def test_invalid_position_is_never_closed(rm):
+    assert rm.should_close_position(_position(0.0, -100.0, entry=0.0)) is False
+
+
+def test_book_grows_and_reuses_buffers():
+    book = PositionBook(capacity=2)
+    book.load([_position(0.01 * i, 0.0) for i in range(1, 6)])
+    assert len(book) == 5
+    assert book.amt.tolist() == pytest.approx([0.01, 0.02, 0.03, 0.04, 0.05])
+
+    buffer = book._amt
+    book.load([_position(-0.01, 1.5)])
+    assert book._amt is buffer  # shrinking reuses the grown buffer
+    assert book.amt.tolist() == [-0.01]
+    assert book.unrealized.tolist() == [1.5]
+
+
+def test_evaluate_all_masks(rm):
+    book = PositionBook.from_positions([
+        _position(0.01, -4.2),           # drift 0.84% → close
+        _position(-0.01, 0.5),           # healthy
+        _position(0.0, 0.0, entry=0.0),  # empty side → never flagged
+    ])
+    close_mask, can_open = rm.evaluate_all(book)
+    assert close_mask.tolist() == [True, False, False]
+    assert can_open
+
+
+def test_flagged_positions_do_not_block_opening(rm):
+    # 0.15 BTC @ $50k = $7,500 - at the max safe exposure on its own
+    big = _position(0.15, 0.0)
+    assert not rm.evaluate_all(PositionBook.from_positions([big]))[1]
+    assert not rm.can_open_new_position(50_000.0, [big])
+
+    # ...but if it's being closed (stop-loss), it doesn't count
+    losing = _position(0.15, -100.0)
+    close_mask, can_open = rm.evaluate_all(PositionBook.from_positions([losing]))
+    assert close_mask.tolist() == [True]
+    assert can_open
@@ -0,0 +1,73 @@
+"""Unit tests for the settings loader (.env parser, type conversion, caching)"""
+import pytest
+
+from aster_operator.config import settings as settings_module
+from aster_operator.config.settings import _convert, _parse_dotenv, get_settings, load_settings
+
+
+def test_parse_dotenv(tmp_path):
+    env = tmp_path / ".env"
+    env.write_text(
+        "# comment\n"
+        "\n"
+        "ASTER_API_KEY=abc\n"
+        "export LEVERAGE=5\n"
+        "WALLET_ADDRESS='0x 1'\n"
+        'REFERRAL_CODE="x # not a comment"\n'
+        "CAPITAL_USDT=250 # trailing comment\n"
+        "NOT_A_PAIR\n"
+    )
+    assert _parse_dotenv(str(env)) == {
+        "ASTER_API_KEY": "abc",
+        "LEVERAGE": "5",
+        "WALLET_ADDRESS": "0x 1",
+        "REFERRAL_CODE": "x # not a comment",
+        "CAPITAL_USDT": "250",
+    }
+
+
+def test_parse_dotenv_missing_file(tmp_path):
+    assert _parse_dotenv(str(tmp_path / "nope.env")) == {}
+
+
+def test_convert_types():
+    assert _convert("leverage", "7", int) == 7
+    assert _convert("capital_usdt", "12.5", float) == 12.5
+    assert _convert("flag", "Yes", bool) is True
+    assert _convert("flag", "0", bool) is False
+    assert _convert("trading_pairs", '["BTCUSDT","ETHUSDT"]', list) == ["BTCUSDT", "ETHUSDT"]
+
+
+def test_convert_reports_the_setting_name():
+    with pytest.raises(ValueError, match="LEVERAGE"):
+        _convert("leverage", "fifteen", int)
+
+
+def test_environment_wins_over_dotenv(tmp_path, monkeypatch):
+    env = tmp_path / ".env"
+    env.write_text("LEVERAGE=3\nPOSITION_HOLD_TIME_MIN=120\n")
+    monkeypatch.setenv("LEVERAGE", "9")
+    s = load_settings(str(env))
+    assert s.leverage == 9
+    assert s.position_hold_time_min == 120
+
+
+def test_missing_required_settings(tmp_path, monkeypatch):
+    monkeypatch.delenv("ASTER_API_KEY")
+    with pytest.raises(ValueError, match="ASTER_API_KEY"):
+        load_settings(str(tmp_path / "none.env"))
+
+
+def test_cache_clear_reloads_environment(monkeypatch):
+    get_settings.cache_clear()
+    try:
+        monkeypatch.setenv("LEVERAGE", "5")
+        assert get_settings().leverage == 5
+        monkeypatch.setenv("LEVERAGE", "7")
+        assert get_settings().leverage == 5  # cached
+        get_settings.cache_clear()
+        assert get_settings().leverage == 7
+        assert settings_module.settings is get_settings()
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
@@ -0,0 +1,454 @@
+"""Unit tests for DeltaNeutralStrategy's reconcile / rotation logic (no network)"""
+import asyncio
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from prometheus_client import REGISTRY
+
+from aster_operator.database.db import get_db, init_db
+from aster_operator.exchange import aster_stream
+from aster_operator.database.models import DailyStats, Position, Trade
+from aster_operator.strategy.delta_neutral import DeltaNeutralStrategy
+from test_aster_stream import FakeSocket, mark_price
+
+
+class FakeExchange:
+    """Async stand-in for AsyncAsterExchangeClient - records closes"""
+
+    def __init__(self, price: float = 50_000.0):
+        self.price = price
+        self.positions = []
+        self.closed = []
+        self.fail = set()  # sides whose close raises
+        self._order_ids = itertools.count(1)
+
+    async def close_position(self, symbol, position_side):
+        if position_side in self.fail:
+            raise RuntimeError(f"close {position_side} rejected")
+        self.closed.append(position_side)
+        return {
+            "orderId": f"close-{next(self._order_ids)}",
+            "side": "SELL" if position_side == "LONG" else "BUY",
+            "executedQty": "0.01",
+            "avgPrice": str(self.price),
+            "realizedPnl": "0",
+        }
+
+    async def get_position_risk(self, symbol=None):
+        return self.positions
+
+    async def get_mark_price_cached(self, symbol, max_age=2.0):
+        return self.price
+
+    async def set_leverage(self, symbol, leverage):
+        return None  # e.g. "already set" - the sync client swallows it
+
+    async def set_position_mode(self, dual_side_position):
+        return None
+
+    def close(self):
+        pass
+
+
+def _position(side, amt, entry=50_000.0, unrealized=0.0):
+    return {
+        "symbol": "BTCUSDT",
+        "positionSide": side,
+        "positionAmt": str(amt),
+        "entryPrice": str(entry),
+        "unRealizedProfit": str(unrealized),
+    }
+
+
+def _holding(strategy):
+    """Pretend a pair is open (as _open_delta_neutral_pair would leave it)"""
+    strategy.active_positions = {
+        side: {"is_active": True, "opened_monotonic": 0.0} for side in ("LONG", "SHORT")
+    }
+
+
+async def _reconcile(strategy, positions):
+    """What run_cycle / the stream check do: evaluate, then reconcile"""
+    book = strategy.risk_manager.book.load(positions)
+    close_mask, can_open = strategy.risk_manager.evaluate_all(book)
+    await strategy._reconcile_positions(positions, book, close_mask)
+    return can_open
+
+
+def _metric(name, **labels):
+    return REGISTRY.get_sample_value(name, {"symbol": "BTCUSDT", **labels}) or 0.0
+
+
+@pytest.fixture
+def strategy():
+    init_db()
+    with get_db() as db:
+        db.query(Trade).delete()
+        db.query(Position).delete()
+    s = DeltaNeutralStrategy()
+    s.client = s.risk_manager.client = FakeExchange()
+    return s
+
+
+def test_one_flagged_leg_closes_the_whole_pair(strategy):
+    """LONG breaches drift (0.84%), SHORT doesn't - neither may stay open"""
+    positions = [
+        _position("LONG", 0.01, unrealized=-4.2),
+        _position("SHORT", -0.01, unrealized=0.0),
+    ]
+
+    async def scenario():
+        _holding(strategy)
+        strategy._schedule_rotation()
+        await _reconcile(strategy, positions)
+
+    asyncio.run(scenario())
+
+    assert sorted(strategy.client.closed) == ["LONG", "SHORT"]
+    assert not any(p["is_active"] for p in strategy.active_positions.values())
+    assert strategy._rotation_handle is None
+    # Nothing left open → the next heartbeat opens a fresh pair
+    assert strategy._should_open_new_positions()
+
+
+def test_failed_leg_close_records_the_other_and_retries(strategy):
+    """SHORT close fails: LONG is still recorded, SHORT is retried next tick"""
+    with get_db() as db:
+        db.add_all([
+            Position(symbol="BTCUSDT", position_side=side, entry_price=50_000.0,
+                     quantity=0.01, leverage=15, notional=500.0)
+            for side in ("LONG", "SHORT")
+        ])
+    strategy.client.fail = {"SHORT"}
+
+    async def scenario():
+        _holding(strategy)
+        strategy._schedule_rotation()
+        with pytest.raises(RuntimeError):
+            await _reconcile(strategy, [
+                _position("LONG", 0.01, unrealized=-4.2),
+                _position("SHORT", -0.01, unrealized=0.0),
+            ])
+        assert strategy._rotation_handle is None
+        assert not strategy.active_positions["LONG"]["is_active"]
+        assert strategy.active_positions["SHORT"]["is_active"]
+        with get_db() as db:
+            assert db.query(Position).filter_by(is_active=True).one().position_side == "SHORT"
+            assert db.query(Trade).one().position_side == "LONG"
+
+        # Next update: LONG is gone and SHORT is within limits - close it anyway
+        strategy.client.fail = set()
+        await _reconcile(strategy, [
+            _position("LONG", 0.0, entry=0.0),
+            _position("SHORT", -0.01, unrealized=0.0),
+        ])
+
+    asyncio.run(scenario())
+
+    assert strategy.client.closed == ["LONG", "SHORT"]
+    assert not any(p["is_active"] for p in strategy.active_positions.values())
+    assert not strategy._failed_closes
+
+
+def test_healthy_pair_keeps_rotation_timer(strategy):
+    positions = [
+        _position("LONG", 0.01, unrealized=-0.5),
+        _position("SHORT", -0.01, unrealized=0.5),
+    ]
+
+    async def scenario():
+        _holding(strategy)
+        strategy._schedule_rotation()
+        await _reconcile(strategy, positions)
+        handle = strategy._rotation_handle
+        strategy._cancel_rotation()
+        return handle
+
+    assert asyncio.run(scenario()) is not None
+    assert strategy.client.closed == []
+    assert all(p["is_active"] for p in strategy.active_positions.values())
+    assert not strategy._should_open_new_positions()
+
+
+def test_leg_closed_on_exchange_is_marked_inactive(strategy):
+    """Size 0 on the exchange (e.g. manual close) → tracking follows"""
+    _holding(strategy)
+    asyncio.run(_reconcile(strategy, [
+        _position("LONG", 0.0, entry=0.0),
+        _position("SHORT", -0.01),
+    ]))
+
+    assert strategy.client.closed == []
+    assert not strategy.active_positions["LONG"]["is_active"]
+    assert strategy.active_positions["SHORT"]["is_active"]
+
+
+def test_risk_close_is_recorded_and_counted(strategy):
+    """Risk closes update the Position rows, add Trade rows and count in /metrics"""
+    with get_db() as db:
+        db.add_all([
+            Position(symbol="BTCUSDT", position_side=side, entry_price=50_000.0,
+                     quantity=0.01, leverage=15, notional=500.0)
+            for side in ("LONG", "SHORT")
+        ])
+    trades_before = _metric("aster_trades_total", position_side="SHORT")
+    volume_before = _metric("aster_trade_volume_usdt_total", position_side="SHORT")
+
+    _holding(strategy)
+    asyncio.run(_reconcile(strategy, [
+        _position("LONG", 0.01, unrealized=-600.0),
+        _position("SHORT", -0.01, unrealized=600.0),
+    ]))
+
+    with get_db() as db:
+        rows = db.query(Position).all()
+        assert len(rows) == 2
+        assert all(not row.is_active and row.exit_price == 50_000.0 for row in rows)
+        trades = {t.position_side: t for t in db.query(Trade).all()}
+        assert sorted(trades) == ["LONG", "SHORT"]
+        assert trades["LONG"].side == "SELL" and trades["SHORT"].side == "BUY"
+        assert all(t.notional == 500.0 and t.timestamp is not None for t in trades.values())
+    assert _metric("aster_trades_total", position_side="SHORT") == trades_before + 1
+    assert _metric("aster_trade_volume_usdt_total", position_side="SHORT") == volume_before + 500.0
+
+
+def test_lone_leg_opening_recorded_before_undo(strategy):
+    """SHORT rejected: the LONG fill is recorded (open and close), then we raise"""
+    long_order = {"orderId": 7, "side": "BUY", "executedQty": "0.01",
+                  "avgPrice": "50000", "commission": "0.2"}
+    short_order = {"code": -2019, "msg": "Margin is insufficient."}
+    trades_before = _metric("aster_trades_total", position_side="LONG")
+
+    with pytest.raises(RuntimeError, match="SHORT"):
+        asyncio.run(strategy._ensure_both_legs_filled(long_order, short_order))
+
+    assert strategy.client.closed == ["LONG"]
+    with get_db() as db:
+        assert sorted((t.position_side, t.side) for t in db.query(Trade).all()) == [
+            ("LONG", "BUY"), ("LONG", "SELL"),
+        ]
+        row = db.query(Position).one()
+        assert row.position_side == "LONG" and not row.is_active
+    assert _metric("aster_trades_total", position_side="LONG") == trades_before + 2
+
+
+def test_exchange_config_cached_when_already_applied(strategy, tmp_path):
+    """Steady state: both setup calls report "no change" → cache still written"""
+    strategy._config_cache_path = tmp_path / "exchange_config.json"
+    assert not strategy._exchange_config_is_cached()
+
+    asyncio.run(strategy._configure_exchange())
+
+    assert strategy._exchange_config_is_cached()
+
+
+def test_exposure_limit_blocks_new_pair(strategy):
+    """No tracked pair, but a large untracked position eats the exposure budget"""
+    async def scenario():
+        return await _reconcile(strategy, [
+            _position("LONG", 0.15, unrealized=0.0),
+            _position("SHORT", 0.0, entry=0.0),
+        ])
+
+    can_open = asyncio.run(scenario())
+
+    assert strategy.client.closed == []
+    assert not can_open
+    assert not strategy._should_open_new_positions(can_open)
+
+
+def test_heartbeat_resync_closes_risky_pair_over_rest(strategy):
+    """Resync due → run_cycle evaluates fresh REST data and acts on it"""
+    strategy.client.positions = [
+        _position("LONG", 0.01, unrealized=-4.2),
+        _position("SHORT", -0.01, unrealized=0.0),
+    ]
+    strategy._cycles_since_resync = strategy.REST_RESYNC_EVERY_N_CYCLES
+    opened_at = []
+
+    async def fake_open(price=None):
+        opened_at.append(price)
+
+    async def scenario():
+        _holding(strategy)
+        strategy._schedule_rotation()
+        strategy._open_delta_neutral_pair = fake_open
+        await strategy.run_cycle()
+
+    asyncio.run(scenario())
+
+    assert sorted(strategy.client.closed) == ["LONG", "SHORT"]
+    assert strategy._cycles_since_resync == 0
+    assert strategy._rotation_handle is None
+    # Pair closed → reopened in the same cycle, at the price evaluate() fetched
+    assert opened_at == [50_000.0]
+
+
+def test_daily_stats_row_refreshed_from_trades(strategy):
+    """_log_daily_stats aggregates today's trades into one DailyStats row"""
+    with get_db() as db:
+        db.query(DailyStats).delete()
+        db.add_all([
+            Trade(symbol="BTCUSDT", side=side, position_side=pos_side, quantity=0.01,
+                  price=50_000.0, notional=500.0, order_id=f"stats-{pos_side}",
+                  realized_pnl=pnl, commission=0.2)
+            for side, pos_side, pnl in (("BUY", "LONG", 1.5), ("SELL", "SHORT", -0.5))
+        ])
+
+    # Twice: the second refresh replaces the row instead of adding one
+    strategy._log_daily_stats(datetime.now(timezone.utc))
+    strategy._log_daily_stats(datetime.now(timezone.utc))
+
+    with get_db() as db:
+        stats = db.query(DailyStats).one()
+        assert (stats.num_trades, stats.total_volume) == (2, 1000.0)
+        assert stats.realized_pnl == pytest.approx(1.0)
+        assert stats.fees_paid == pytest.approx(0.4)
+
+
+def test_closes_update_each_side_with_its_own_values(strategy):
+    """One CASE UPDATE: each side gets its own exit price, PnL and hold time"""
+    with get_db() as db:
+        db.add_all([
+            Position(symbol="BTCUSDT", position_side=side, entry_price=50_000.0,
+                     quantity=0.01, leverage=15, notional=500.0, is_active=active)
+            for side, active in (("LONG", True), ("SHORT", True), ("LONG", False))
+        ])
+    strategy.active_positions = {
+        "LONG": {"is_active": True, "opened_monotonic": time.monotonic() - 95 * 60},
+        "SHORT": {"is_active": True, "opened_monotonic": time.monotonic() - 30 * 60},
+    }
+
+    strategy._record_closed_positions({
+        "LONG": {"orderId": 1, "executedQty": "0.01", "avgPrice": "50100", "realizedPnl": "1.0"},
+        "SHORT": {"orderId": 2, "executedQty": "0.01", "avgPrice": "50200", "realizedPnl": "-2.0"},
+    })
+
+    with get_db() as db:
+        closed = {row.position_side: row for row in db.query(Position)
+                  .filter(Position.closed_at.is_not(None))}
+        assert (closed["LONG"].exit_price, closed["LONG"].realized_pnl) == (50_100.0, 1.0)
+        assert (closed["SHORT"].exit_price, closed["SHORT"].realized_pnl) == (50_200.0, -2.0)
+        assert (closed["LONG"].hold_time_minutes, closed["SHORT"].hold_time_minutes) == (95, 30)
+        # The already-closed LONG row from an earlier pair is left alone
+        assert db.query(Position).filter(Position.closed_at.is_(None)).count() == 1
+
+
+def test_hold_time_after_restart_comes_from_opened_at(strategy):
+    """No in-memory open time (restarted bot) → hold time from the DB row"""
+    opened_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=45)
+    with get_db() as db:
+        position = Position(symbol="BTCUSDT", position_side="LONG", entry_price=50_000.0,
+                            quantity=0.01, leverage=15, notional=500.0)
+        position.opened_at = opened_at  # init=False column
+        db.add(position)
+
+    strategy._record_closed_positions({
+        "LONG": {"orderId": 1, "executedQty": "0.01", "avgPrice": "50100", "realizedPnl": "1.0"},
+    })
+
+    with get_db() as db:
+        assert db.query(Position).one().hold_time_minutes == 45
+
+
+def test_rotation_waits_for_risk_close_then_skips(strategy):
+    """Timer fires mid-reconcile → it waits for the lock, sees nothing open"""
+    rotated = []
+
+    async def fake_rotate():
+        rotated.append(True)
+
+    strategy._rotate_positions = fake_rotate
+
+    async def scenario():
+        _holding(strategy)
+        async with strategy._trade_lock:
+            strategy._start_rotation_task()  # as if call_later fired now
+            await asyncio.sleep(0)           # rotation task blocks on the lock
+            await _reconcile(strategy, [
+                _position("LONG", 0.01, unrealized=-6.0),
+                _position("SHORT", -0.01, unrealized=6.0),
+            ])
+        await strategy._rotation_task
+
+    asyncio.run(scenario())
+
+    assert sorted(strategy.client.closed) == ["LONG", "SHORT"]
+    assert rotated == []
+    assert strategy._rotation_handle is None
+
+
+def test_failed_rotation_is_retried(strategy):
+    async def failing_rotate():
+        raise RuntimeError("exchange down")
+
+    strategy._rotate_positions = failing_rotate
+
+    async def scenario():
+        _holding(strategy)
+        strategy._start_rotation_task()
+        await strategy._rotation_task
+        handle = strategy._rotation_handle
+        strategy._cancel_rotation()
+        return handle
+
+    assert asyncio.run(scenario()) is not None
+
+
+def test_stop_cancels_in_flight_tasks_before_closing_client(strategy):
+    """A risk check or rotation still running must not outlive the client"""
+    running = []
+
+    async def in_flight():
+        try:
+            await asyncio.Event().wait()
+        finally:
+            running.append(strategy.client.is_closed)
+
+    strategy.client.is_closed = False
+    strategy.client.close = lambda: setattr(strategy.client, "is_closed", True)
+
+    async def scenario():
+        strategy._risk_task = asyncio.create_task(in_flight())
+        strategy._rotation_task = asyncio.create_task(in_flight())
+        await asyncio.sleep(0)
+        await strategy.stop()
+
+    asyncio.run(scenario())
+
+    assert running == [False, False]  # both unwound while the client was open
+    assert strategy._risk_task is None and strategy._rotation_task is None
+
+
+def test_stream_update_after_reconnect_runs_risk_check(strategy, monkeypatch):
+    """Each connect seeds itself → the first tick after it is risk-checked"""
+    sync = strategy.streamer.client
+    sync.start_user_stream = lambda: "listen-key"
+    sync.get_position_risk = lambda symbol=None: [
+        _position("LONG", 0.01), _position("SHORT", -0.01),
+    ]
+    strategy.streamer.on_update = strategy._on_stream_update
+
+    async def connection(price):
+        """One stream connection delivering one mark price tick"""
+        hold = asyncio.Event()
+        socket = FakeSocket([mark_price(price)], hold)
+        monkeypatch.setattr(aster_stream.websockets, "connect", lambda url, **kw: socket)
+        task = asyncio.create_task(strategy.streamer._connect_once())
+        await socket.drained.wait()
+        await strategy._risk_task  # runs while the connection is up
+        hold.set()
+        await task
+
+    async def scenario():
+        _holding(strategy)
+        await connection(50_000)
+        assert strategy.client.closed == []
+        # Reconnect - price dropped 2% while we were disconnected
+        await connection(49_000)
+
+    asyncio.run(scenario())
+
+    assert sorted(strategy.client.closed) == ["LONG", "SHORT"]